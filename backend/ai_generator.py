@@ -1,7 +1,87 @@
 import json
-from typing import Any, Dict, List, Optional
-
-import boto3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+
+    # orjson emits UTF-8 bytes directly, which invoke_model accepts as the request body
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+# Connection pool sized for concurrent API requests, with keep-alive so Bedrock calls
+# reuse TLS connections instead of paying a handshake per request
+_BOTO_CONFIG_OPTIONS = {
+    "max_pool_connections": 64,
+    "retries": {"mode": "adaptive", "max_attempts": 3},
+    "tcp_keepalive": True,
+    "read_timeout": 60,
+    "connect_timeout": 3,
+}
+
+# Constant request fields, serialized once at import
+_ANTHROPIC_VERSION = "bedrock-2023-05-31"
+_TOOL_CHOICE_AUTO = {"type": "auto"}
+_TOOL_CHOICE_AUTO_BYTES = b',"tool_choice":' + _dumps(_TOOL_CHOICE_AUTO)
+
+# Shared, bounded pool for running a response's tool calls concurrently
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool")
+
+# Yielded by generate_response_stream in place of a text chunk: drop the text streamed so far.
+# Text Claude writes before a tool call only introduces it, so it is withdrawn once the
+# tool_use block starts and the streamed answer ends up matching generate_response.
+DISCARD_TEXT = object()
+
+
+@lru_cache(maxsize=None)
+def _get_bedrock_client(**client_config):
+    """Return a shared bedrock-runtime client so all generators use one connection pool"""
+    # Imported on first use so loading boto3 and its service models stays off app/test startup
+    import boto3
+    from botocore.config import Config as BotoConfig
+
+    return boto3.client(config=BotoConfig(**_BOTO_CONFIG_OPTIONS), **client_config)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of final response text keyed by the request inputs"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def put(self, key: Tuple, response: str):
+        """Store a response, evicting the least recently used entry when full"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
 
 
 class AIGenerator:
@@ -38,6 +118,40 @@ All responses must be:
 Provide only the direct answer to what was asked.
 """
 
+    # Static system block marked as a prompt cache breakpoint. Tool definitions precede the
+    # system prompt in the cache prefix, so the tool schemas are cached along with it.
+    SYSTEM_BLOCK = {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+
+    # Header for the uncached conversation history block that follows SYSTEM_BLOCK
+    HISTORY_HEADER = "Previous conversation:\n"
+
+    # Generation parameters sent with every request
+    TEMPERATURE = 0
+    MAX_TOKENS = 800
+
+    # Constant leading request fields, serialized once without the closing brace so
+    # per-call fields can be spliced in behind them
+    BODY_PREFIX = _dumps(
+        {
+            "anthropic_version": _ANTHROPIC_VERSION,
+            "temperature": TEMPERATURE,
+            "max_tokens": MAX_TOKENS,
+        }
+    )[:-1]
+
+    # Tool outputs that mean a search came back empty (see search_tools)
+    EMPTY_TOOL_RESULT_PREFIXES = ("No relevant content found", "No course found")
+
+    __slots__ = (
+        "_client",
+        "_client_config",
+        "model_id",
+        "invoke_params",
+        "_tools_cache",
+        "response_cache",
+        "short_circuit_empty_tools",
+    )
+
     def __init__(
         self,
         aws_access_key_id: str,
@@ -45,24 +159,61 @@ Provide only the direct answer to what was asked.
         aws_session_token: str,
         aws_region: str,
         model_id: str,
+        latency_mode: str = "standard",
+        response_cache_size: int = 128,
+        short_circuit_empty_tools: bool = False,
+        client=None,
     ):
-        # Build client config
+        # Build client config; boto3 ignores a None session token (only temporary
+        # credentials have one)
         client_config = {
             "service_name": "bedrock-runtime",
             "region_name": aws_region,
             "aws_access_key_id": aws_access_key_id,
             "aws_secret_access_key": aws_secret_access_key,
+            "aws_session_token": aws_session_token or None,
         }
 
-        # Add session token if provided (for temporary credentials)
-        if aws_session_token:
-            client_config["aws_session_token"] = aws_session_token
-
-        self.client = boto3.client(**client_config)
+        # The Bedrock client is created on first use (see the client property) unless one
+        # is injected, e.g. a stub in tests
+        self._client = client
+        self._client_config = client_config
         self.model_id = model_id
 
-        # Pre-build base API parameters
-        self.base_params = {"temperature": 0, "max_tokens": 800}
+        # Keyword arguments shared by every invoke_model call. Bodies are passed as the
+        # encoder's UTF-8 bytes, so boto3 sends them without another copy. Latency-optimized
+        # inference is only available for some models/regions, so it is opt-in via config.
+        self.invoke_params = {
+            "modelId": model_id,
+            "contentType": "application/json",
+            "accept": "application/json",
+        }
+        if latency_mode != "standard":
+            self.invoke_params["performanceConfigLatency"] = latency_mode
+
+        # Last tool definitions list seen and its pre-serialized request fragment. Tool
+        # definitions rarely change, so the largest part of the body is encoded only once.
+        self._tools_cache: Tuple[Optional[List], bytes] = (None, b"")
+
+        # Answers that did not use tools depend only on the request inputs, so repeated
+        # questions can skip the Bedrock round-trip entirely
+        self.response_cache = ResponseCache(response_cache_size)
+
+        # When every tool comes back empty, the follow-up call can only say so; return the
+        # tools' own no-results messages instead. Off by default so multi-hop queries
+        # always get their follow-up round.
+        self.short_circuit_empty_tools = short_circuit_empty_tools
+
+    @property
+    def client(self):
+        """Bedrock runtime client, created on first access"""
+        if self._client is None:
+            self._client = _get_bedrock_client(**self._client_config)
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
 
     def generate_response(
         self,
@@ -83,44 +234,184 @@ Provide only the direct answer to what was asked.
         Returns:
             Generated response as string
         """
+        cache_key = self._cache_key(query, conversation_history, tools)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            return cached_response
 
-        # Build system content efficiently - avoid string ops when possible
-        system_content = (
-            f"{self.SYSTEM_PROMPT}\n\nPrevious conversation:\n{conversation_history}"
-            if conversation_history
-            else self.SYSTEM_PROMPT
-        )
-
-        # Prepare API call parameters for Bedrock
-        request_body = {
-            **self.base_params,
-            "anthropic_version": "bedrock-2023-05-31",
-            "messages": [{"role": "user", "content": query}],
-            "system": system_content,
-        }
-
-        # Add tools if available
-        if tools:
-            request_body["tools"] = tools
-            request_body["tool_choice"] = {"type": "auto"}
+        request_body = self._build_request_body(query, conversation_history)
 
         # Get response from Claude via Bedrock
         bedrock_response = self.client.invoke_model(
-            modelId=self.model_id, body=json.dumps(request_body)
+            body=self._encode_request(request_body, tools), **self.invoke_params
         )
 
         # Parse response
-        response_body = json.loads(bedrock_response["body"].read())
+        response_body = _loads(bedrock_response["body"].read())
 
         # Handle tool execution if needed
         if response_body["stop_reason"] == "tool_use" and tool_manager:
-            return self._handle_tool_execution(response_body, request_body, tool_manager)
+            return self._handle_tool_execution(response_body, request_body, tools, tool_manager)
+
+        # Return direct response; only complete answers that did not depend on tool output
+        # are cached (a max_tokens answer is truncated)
+        response_text = response_body["content"][0]["text"]
+        if response_body["stop_reason"] == "end_turn":
+            self.response_cache.put(cache_key, response_text)
+        return response_text
+
+    def generate_response_stream(
+        self,
+        query: str,
+        conversation_history: Optional[str] = None,
+        tools: Optional[List] = None,
+        tool_manager=None,
+    ) -> Iterator[Any]:
+        """
+        Stream AI response text as Claude generates it.
+
+        Text deltas are yielded as soon as they arrive, in the first response and in every
+        tool round's follow-up. When Claude starts a tool_use block after writing some text,
+        DISCARD_TEXT is yielded to withdraw that preamble; the text left after the last
+        DISCARD_TEXT matches what generate_response returns.
+
+        Args:
+            query: The user's question or request
+            conversation_history: Previous messages for context
+            tools: Available tools the AI can use
+            tool_manager: Manager to execute tools
+
+        Yields:
+            Chunks of the generated response text, or DISCARD_TEXT
+        """
+        cache_key = self._cache_key(query, conversation_history, tools)
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            yield cached_response
+            return
+
+        request_body = self._build_request_body(query, conversation_history)
+
+        # Without a tool manager a tool_use response is returned as is, preamble included
+        response_body = yield from self._stream_message(
+            request_body, tools, drop_preamble=bool(tool_manager)
+        )
+        stop_reason = response_body["stop_reason"]
+
+        if stop_reason == "tool_use" and tool_manager:
+            yield from self._tool_rounds(
+                response_body, request_body, tools, tool_manager, stream=True
+            )
+        elif stop_reason == "end_turn" and response_body["content"]:
+            self.response_cache.put(cache_key, response_body["content"][0]["text"])
+
+    def _stream_message(
+        self, request_body: Dict[str, Any], tools: Optional[List], drop_preamble: bool
+    ) -> Iterator[Any]:
+        """
+        Make one streaming Bedrock call, yielding text deltas as they arrive.
+
+        Args:
+            request_body: Per-call request fields (messages, system)
+            tools: Tool definitions to offer, if any
+            drop_preamble: Withdraw text written before a tool_use block with DISCARD_TEXT,
+                and hold back any text after it
+
+        Yields:
+            Text deltas, or DISCARD_TEXT
+
+        Returns:
+            Response body rebuilt from the stream events (stop_reason and content blocks)
+        """
+        bedrock_response = self.client.invoke_model_with_response_stream(
+            body=self._encode_request(request_body, tools), **self.invoke_params
+        )
+
+        # Rebuild the content blocks from stream events so tool_use can be dispatched
+        content = []
+        stop_reason = None
+        streamed_text = False
+        hold_text = False
+
+        for event in bedrock_response["body"]:
+            chunk = event.get("chunk")
+            if not chunk:
+                continue
+
+            data = _loads(chunk["bytes"])
+            event_type = data["type"]
+
+            if event_type == "content_block_start":
+                block = dict(data["content_block"])
+                if block["type"] == "tool_use":
+                    # Tool input arrives as partial JSON strings, parsed once the stream ends
+                    block["input"] = ""
+                    if drop_preamble:
+                        if streamed_text:
+                            yield DISCARD_TEXT
+                            streamed_text = False
+                        hold_text = True
+                elif block["type"] == "text" and streamed_text and not hold_text:
+                    # Separate text blocks the way _join_text does
+                    yield " "
+                content.append(block)
+            elif event_type == "content_block_delta":
+                delta = data["delta"]
+                block = content[data["index"]]
+                if delta["type"] == "text_delta":
+                    block["text"] += delta["text"]
+                    if not hold_text:
+                        streamed_text = True
+                        yield delta["text"]
+                elif delta["type"] == "input_json_delta":
+                    block["input"] += delta["partial_json"]
+            elif event_type == "message_delta":
+                stop_reason = data["delta"].get("stop_reason")
+
+        for block in content:
+            if block["type"] == "tool_use":
+                block["input"] = _loads(block["input"]) if block["input"] else {}
+
+        return {"stop_reason": stop_reason, "content": content}
+
+    def _cache_key(
+        self, query: str, conversation_history: Optional[str], tools: Optional[List]
+    ) -> Tuple:
+        """Build the response cache key for a request's inputs"""
+        return (query, conversation_history, self._tools_fragment(tools) if tools else None)
+
+    def _build_request_body(
+        self, query: str, conversation_history: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Build the initial Bedrock request body for a user query.
+
+        Args:
+            query: The user's question or request
+            conversation_history: Previous messages for context
+
+        Returns:
+            Per-call request fields (see _encode_request)
+        """
+        # Keep the cached system block first so conversation history doesn't change its cache key
+        system_content = [self.SYSTEM_BLOCK]
+        if conversation_history:
+            system_content.append(
+                {"type": "text", "text": self.HISTORY_HEADER + conversation_history}
+            )
 
-        # Return direct response
-        return response_body["content"][0]["text"]
+        # Prepare per-call API parameters for Bedrock
+        return {
+            "messages": [{"role": "user", "content": query}],
+            "system": system_content,
+        }
 
     def _handle_tool_execution(
-        self, initial_response: Dict[str, Any], base_params: Dict[str, Any], tool_manager
+        self,
+        initial_response: Dict[str, Any],
+        request_body: Dict[str, Any],
+        tools: Optional[List],
+        tool_manager,
     ):
         """
         Handle execution of tool calls with support for sequential rounds (up to 2).
@@ -132,27 +423,65 @@ Provide only the direct answer to what was asked.
 
         Args:
             initial_response: The response body containing tool use requests
-            base_params: Base API parameters (includes messages, system, and tools)
+            request_body: Initial request fields (messages and system), reused for every round
+            tools: Tool definitions offered in the initial request
             tool_manager: Manager to execute tools
 
         Returns:
             Final response text after tool execution
         """
+        return "".join(
+            self._tool_rounds(initial_response, request_body, tools, tool_manager, stream=False)
+        )
+
+    def _tool_rounds(
+        self,
+        initial_response: Dict[str, Any],
+        request_body: Dict[str, Any],
+        tools: Optional[List],
+        tool_manager,
+        stream: bool,
+    ) -> Iterator[Any]:
+        """
+        Run the sequential tool rounds described in _handle_tool_execution.
+
+        Args:
+            initial_response: The response body containing tool use requests
+            request_body: Initial request fields (messages and system), reused for every round
+            tools: Tool definitions offered in the initial request
+            tool_manager: Manager to execute tools
+            stream: Stream each follow-up call's text as it arrives (see
+                generate_response_stream) instead of yielding the final text once
+
+        Yields:
+            The final response text, or with stream its chunks and DISCARD_TEXT markers
+        """
         MAX_TOOL_ROUNDS = 2
 
-        # Start with existing messages
-        messages = base_params["messages"].copy()
+        # Every round re-sends the same request dict; only its message list grows. Callers
+        # build it fresh for each query, so it is safe to extend in place.
+        messages = request_body["messages"]
 
         # Add AI's initial tool use response
         messages.append({"role": "assistant", "content": initial_response["content"]})
 
         current_round = 1
-        current_response = initial_response
-        tools = base_params.get("tools")
+        _, tool_blocks = self._partition_blocks(initial_response["content"])
 
         while current_round <= MAX_TOOL_ROUNDS:
             # Execute tools from current response
-            tool_results = self._execute_tools_from_response(current_response, tool_manager)
+            tool_results = self._execute_tools(tool_blocks, tool_manager)
+
+            # Skip the follow-up call when it has nothing to work with. Text written next to
+            # the tool calls is only a preamble, so the answer states the empty result. Later
+            # rounds always get their follow-up, which can still use earlier rounds' results.
+            if (
+                self.short_circuit_empty_tools
+                and current_round == 1
+                and self._all_empty(tool_results)
+            ):
+                yield self._no_results_message(tool_results)
+                return
 
             # Add tool results to messages
             if tool_results:
@@ -162,110 +491,181 @@ Provide only the direct answer to what was asked.
             is_last_round = current_round == MAX_TOOL_ROUNDS
             include_tools = not is_last_round
 
-            # Make next API call
-            next_response = self._make_followup_call(
-                messages, base_params["system"], include_tools, tools
-            )
+            # Make next API call, only including tools if not on final round
+            round_tools = tools if include_tools else None
+            if stream:
+                # Only a response that may call tools again can have a preamble to withdraw
+                next_response = yield from self._stream_message(
+                    request_body, round_tools, drop_preamble=include_tools
+                )
+            else:
+                bedrock_response = self.client.invoke_model(
+                    body=self._encode_request(request_body, round_tools), **self.invoke_params
+                )
+                next_response = _loads(bedrock_response["body"].read())
 
-            # Check termination conditions
-            if next_response["stop_reason"] != "tool_use":
-                # No more tool calls - return final text
-                return self._extract_text_from_response(next_response)
+            # Split the response once - text and tool_use blocks are both needed below
+            text_blocks, tool_blocks = self._partition_blocks(next_response["content"])
 
-            if is_last_round:
-                # Hit max rounds - extract text from response (ignore tool_use blocks)
-                return self._extract_text_from_response(next_response)
+            # Check termination conditions: no more tool calls, or max rounds hit (tool_use
+            # blocks ignored). Streamed text has already been yielded; only the fallback for
+            # a response without text is left.
+            if next_response["stop_reason"] != "tool_use" or is_last_round:
+                if not stream or not text_blocks:
+                    yield self._join_text(text_blocks)
+                return
 
             # Prepare for next round
             messages.append({"role": "assistant", "content": next_response["content"]})
-            current_response = next_response
             current_round += 1
 
         # Fallback (should never reach here)
-        return "Unable to generate response after maximum tool rounds."
+        yield "Unable to generate response after maximum tool rounds."
+
+    def _partition_blocks(self, content: List[Dict[str, Any]]) -> Tuple[List[str], List[Dict]]:
+        """
+        Split response content blocks by type in a single pass.
 
-    def _execute_tools_from_response(
-        self, response: Dict[str, Any], tool_manager
+        Args:
+            content: Content blocks from an API response
+
+        Returns:
+            Tuple of (text strings from text blocks, tool_use blocks)
+        """
+        texts = []
+        tool_blocks = []
+        for block in content:
+            block_type = block["type"]
+            if block_type == "text":
+                texts.append(block["text"])
+            elif block_type == "tool_use":
+                tool_blocks.append(block)
+        return texts, tool_blocks
+
+    def _execute_tools(
+        self, tool_blocks: List[Dict[str, Any]], tool_manager
     ) -> List[Dict[str, Any]]:
         """
-        Extract and execute all tool_use blocks from a response.
+        Execute tool_use blocks from a response.
+
+        Multiple tool calls in one response are independent, so they run concurrently
+        on a shared thread pool. Results keep the order of the tool_use blocks. Tools must
+        not report back through shared state for this: RAGSystem passes a per-query
+        ToolSession that collects each call's sources as it returns (see search_tools).
 
         Args:
-            response: API response containing tool_use blocks
+            tool_blocks: tool_use content blocks
             tool_manager: Manager to execute tools
 
         Returns:
             List of tool_result dicts
         """
-        tool_results = []
-        for content_block in response["content"]:
-            if content_block.get("type") == "tool_use":
-                try:
-                    tool_result = tool_manager.execute_tool(
-                        content_block["name"], **content_block["input"]
-                    )
-                except Exception as e:
-                    # Return error as tool result
-                    tool_result = f"Error executing tool '{content_block['name']}': {str(e)}"
-
-                tool_results.append(
-                    {
-                        "type": "tool_result",
-                        "tool_use_id": content_block["id"],
-                        "content": tool_result,
-                    }
-                )
-        return tool_results
+        if len(tool_blocks) > 1:
+            outputs = list(
+                _TOOL_EXECUTOR.map(lambda block: self._run_tool(block, tool_manager), tool_blocks)
+            )
+        else:
+            outputs = [self._run_tool(block, tool_manager) for block in tool_blocks]
 
-    def _make_followup_call(
-        self, messages: List[Dict], system_content: str, include_tools: bool, tools: Optional[List]
-    ) -> Dict[str, Any]:
+        return [
+            {"type": "tool_result", "tool_use_id": block["id"], "content": output}
+            for block, output in zip(tool_blocks, outputs)
+        ]
+
+    def _all_empty(self, tool_results: List[Dict[str, Any]]) -> bool:
         """
-        Make a followup API call with current message history.
+        Check whether a tool round can end without a follow-up call.
 
         Args:
-            messages: Current message history
-            system_content: System prompt content
-            include_tools: Whether to include tools in this call
-            tools: Tool definitions (if include_tools is True)
+            tool_results: Results of executing a response's tool calls
 
         Returns:
-            API response body
+            True if there are results and every one of them is empty
         """
-        request_body = {
-            **self.base_params,
-            "anthropic_version": "bedrock-2023-05-31",
-            "messages": messages,
-            "system": system_content,
-        }
+        return bool(tool_results) and all(
+            not result["content"] or result["content"].startswith(self.EMPTY_TOOL_RESULT_PREFIXES)
+            for result in tool_results
+        )
+
+    def _no_results_message(self, tool_results: List[Dict[str, Any]]) -> str:
+        """
+        Build the answer for a tool round in which every tool came back empty.
+
+        Args:
+            tool_results: Empty results from _all_empty
+
+        Returns:
+            The distinct no-results messages from the tools, one per line
+        """
+        messages = dict.fromkeys(result["content"] for result in tool_results if result["content"])
+        return "\n".join(messages) or "No relevant content found."
 
-        # Only include tools if not on final round
-        if include_tools and tools:
-            request_body["tools"] = tools
-            request_body["tool_choice"] = {"type": "auto"}
+    def _run_tool(self, tool_block: Dict[str, Any], tool_manager) -> str:
+        """
+        Execute a single tool_use block.
 
-        response = self.client.invoke_model(modelId=self.model_id, body=json.dumps(request_body))
+        Args:
+            tool_block: tool_use content block
+            tool_manager: Manager to execute tools
 
-        return json.loads(response["body"].read())
+        Returns:
+            Tool output, or an error message if the tool raised
+        """
+        try:
+            return tool_manager.execute_tool(tool_block["name"], **tool_block["input"])
+        except Exception as e:
+            # Return error as tool result
+            return f"Error executing tool '{tool_block['name']}': {str(e)}"
 
-    def _extract_text_from_response(self, response: Dict[str, Any]) -> str:
+    def _encode_request(self, request_body: Dict[str, Any], tools: Optional[List] = None) -> bytes:
         """
-        Extract text content from response, ignoring tool_use blocks.
+        Serialize per-call request fields between the pre-encoded constant prefix and the
+        pre-encoded tool definitions.
+
+        Args:
+            request_body: Per-call fields (messages, system)
+            tools: Tool definitions to offer, if any
+
+        Returns:
+            Complete JSON request body as bytes
+        """
+        fields = _dumps(request_body)[1:-1]
+        tools_fragment = self._tools_fragment(tools) if tools else b""
+        return b"".join((self.BODY_PREFIX, b",", fields, tools_fragment, b"}"))
+
+    def _tools_fragment(self, tools: List) -> bytes:
+        """
+        Return the serialized tools and tool_choice request fields for a tool list.
+
+        Re-encodes only when a different list object is passed, so tool definitions must
+        not be mutated in place after they are first sent.
+
+        Args:
+            tools: Tool definitions
+
+        Returns:
+            Request body fragment starting with a comma
+        """
+        cached_tools, fragment = self._tools_cache
+        if cached_tools is not tools:
+            fragment = b',"tools":' + _dumps(tools) + _TOOL_CHOICE_AUTO_BYTES
+            self._tools_cache = (tools, fragment)
+        return fragment
+
+    def _join_text(self, texts: List[str]) -> str:
+        """
+        Join text from a response's text blocks, ignoring tool_use blocks.
 
         Used for normal responses and when max rounds reached but Claude still
         wants to use tools.
 
         Args:
-            response: API response body
+            texts: Text strings from _partition_blocks
 
         Returns:
-            Extracted text or fallback message
+            Joined text or fallback message
         """
-        text_blocks = [
-            block["text"] for block in response["content"] if block.get("type") == "text"
-        ]
-
-        if not text_blocks:
+        if not texts:
             return "Unable to provide a complete response."
 
-        return " ".join(text_blocks)
+        return " ".join(texts)
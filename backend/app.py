@@ -2,13 +2,17 @@ import warnings
 
 warnings.filterwarnings("ignore", message="resource_tracker: There appear to be.*")
 
+import json
 import os
 from typing import Any, Dict, List, Optional
 
+from ai_generator import DISCARD_TEXT
 from config import config
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from rag_system import RAGSystem
@@ -75,8 +79,9 @@ async def query_documents(request: QueryRequest):
         if not session_id:
             session_id = rag_system.session_manager.create_session()
 
-        # Process query using RAG system
-        answer, sources = rag_system.query(request.query, session_id)
+        # Process query using RAG system - Bedrock and vector store calls block, so run them
+        # in the threadpool to keep the event loop free for other requests
+        answer, sources = await run_in_threadpool(rag_system.query, request.query, session_id)
 
         # Convert sources to Source model objects
         source_objects = [Source(text=s["text"], link=s.get("link")) for s in sources]
@@ -86,11 +91,45 @@ async def query_documents(request: QueryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/query/stream")
+async def query_documents_stream(request: QueryRequest):
+    """
+    Process a query and stream the response as newline-delimited JSON events
+
+    Events are {"type": "text"} chunks of the answer, {"type": "discard"} when the text sent
+    so far only introduced a tool call and should be dropped, then a final {"type": "done"}
+    with sources and session_id, or {"type": "error"} if the query failed.
+    """
+    # Create session if not provided
+    session_id = request.session_id
+    if not session_id:
+        session_id = rag_system.session_manager.create_session()
+
+    def event_stream():
+        stream = rag_system.query_stream(request.query, session_id)
+        try:
+            while True:
+                chunk = next(stream)
+                if chunk is DISCARD_TEXT:
+                    yield json.dumps({"type": "discard"}) + "\n"
+                else:
+                    yield json.dumps({"type": "text", "text": chunk}) + "\n"
+        except StopIteration as done:
+            # The stream's return value holds the sources collected during the query
+            done_event = {"type": "done", "sources": done.value, "session_id": session_id}
+            yield json.dumps(done_event) + "\n"
+        except Exception as e:
+            # Headers are already sent, so errors are reported in-band
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
+
 @app.get("/api/courses", response_model=CourseStats)
 async def get_course_stats():
     """Get course analytics and statistics"""
     try:
-        analytics = rag_system.get_course_analytics()
+        analytics = await run_in_threadpool(rag_system.get_course_analytics)
         return CourseStats(
             total_courses=analytics["total_courses"], course_titles=analytics["course_titles"]
         )
@@ -115,7 +154,9 @@ async def startup_event():
     if os.path.exists(docs_path):
         print("Loading initial documents...")
         try:
-            courses, chunks = rag_system.add_course_folder(docs_path, clear_existing=False)
+            courses, chunks = await run_in_threadpool(
+                rag_system.add_course_folder, docs_path, clear_existing=False
+            )
             print(f"Loaded {courses} courses with {chunks} chunks")
         except Exception as e:
             print(f"Error loading documents: {e}")
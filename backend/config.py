@@ -17,6 +17,8 @@ class Config:
     AWS_SESSION_TOKEN: str = os.getenv("AWS_SESSION_TOKEN", "")
     AWS_REGION: str = os.getenv("AWS_REGION", "")
     BEDROCK_MODEL_ID: str = "global.anthropic.claude-sonnet-4-5-20250929-v1:0"
+    # "optimized" enables Bedrock latency-optimized inference where the model supports it
+    BEDROCK_LATENCY_MODE: str = os.getenv("BEDROCK_LATENCY_MODE", "standard")
 
     # Embedding model settings
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
@@ -29,6 +31,11 @@ class Config:
 
     # Tool calling settings
     MAX_TOOL_ROUNDS: int = 2  # Maximum sequential tool calling rounds per query
+    # Return the tools' no-results messages instead of a follow-up call when all are empty
+    TOOL_SHORT_CIRCUIT: bool = False
+
+    # Response cache settings
+    RESPONSE_CACHE_SIZE: int = 128  # Cached answers for repeated queries (0 disables)
 
     # Database paths
     CHROMA_PATH: str = "./chroma_db"  # ChromaDB storage location
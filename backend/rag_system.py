@@ -1,7 +1,7 @@
 import os
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
-from ai_generator import AIGenerator
+from ai_generator import DISCARD_TEXT, AIGenerator
 from document_processor import DocumentProcessor
 from models import Course, CourseChunk, Lesson
 from search_tools import CourseOutlineTool, CourseSearchTool, ToolManager
@@ -12,7 +12,7 @@ from vector_store import VectorStore
 class RAGSystem:
     """Main orchestrator for the Retrieval-Augmented Generation system"""
 
-    def __init__(self, config):
+    def __init__(self, config, ai_generator: Optional[AIGenerator] = None):
         self.config = config
 
         # Initialize core components
@@ -20,13 +20,19 @@ class RAGSystem:
         self.vector_store = VectorStore(
             config.CHROMA_PATH, config.EMBEDDING_MODEL, config.MAX_RESULTS
         )
-        self.ai_generator = AIGenerator(
-            config.AWS_ACCESS_KEY_ID,
-            config.AWS_SECRET_ACCESS_KEY,
-            config.AWS_SESSION_TOKEN,
-            config.AWS_REGION,
-            config.BEDROCK_MODEL_ID,
-        )
+        # An injected generator (e.g. a test double) replaces the Bedrock-backed one
+        if ai_generator is None:
+            ai_generator = AIGenerator(
+                config.AWS_ACCESS_KEY_ID,
+                config.AWS_SECRET_ACCESS_KEY,
+                config.AWS_SESSION_TOKEN,
+                config.AWS_REGION,
+                config.BEDROCK_MODEL_ID,
+                config.BEDROCK_LATENCY_MODE,
+                config.RESPONSE_CACHE_SIZE,
+                config.TOOL_SHORT_CIRCUIT,
+            )
+        self.ai_generator = ai_generator
         self.session_manager = SessionManager(config.MAX_HISTORY)
 
         # Initialize search tools
@@ -132,19 +138,20 @@ class RAGSystem:
         if session_id:
             history = self.session_manager.get_conversation_history(session_id)
 
+        # Tools are shared with concurrent requests, so this query's sources are collected
+        # in its own session rather than read back from the tools
+        tool_session = self.tool_manager.start_query()
+
         # Generate response using AI with tools
         response = self.ai_generator.generate_response(
             query=prompt,
             conversation_history=history,
             tools=self.tool_manager.get_tool_definitions(),
-            tool_manager=self.tool_manager,
+            tool_manager=tool_session,
         )
 
-        # Get sources from the search tool
-        sources = self.tool_manager.get_last_sources()
-
-        # Reset sources after retrieving them
-        self.tool_manager.reset_sources()
+        # Get sources from this query's searches
+        sources = tool_session.sources
 
         # Update conversation history
         if session_id:
@@ -153,6 +160,51 @@ class RAGSystem:
         # Return response with sources from tool searches
         return response, sources
 
+    def query_stream(
+        self, query: str, session_id: Optional[str] = None
+    ) -> Generator[Any, None, List[Dict]]:
+        """
+        Process a user query like query(), streaming the response text as it is generated.
+
+        Args:
+            query: User's question
+            session_id: Optional session ID for conversation context
+
+        Yields:
+            Chunks of the response text, or DISCARD_TEXT when the text yielded so far only
+            introduced a tool call and should be dropped
+
+        Returns:
+            Sources list, available as the generator's return value once exhausted
+        """
+        prompt = f"""Answer this question about course materials: {query}"""
+
+        history = None
+        if session_id:
+            history = self.session_manager.get_conversation_history(session_id)
+
+        tool_session = self.tool_manager.start_query()
+
+        chunks = []
+        for chunk in self.ai_generator.generate_response_stream(
+            query=prompt,
+            conversation_history=history,
+            tools=self.tool_manager.get_tool_definitions(),
+            tool_manager=tool_session,
+        ):
+            if chunk is DISCARD_TEXT:
+                chunks.clear()
+            else:
+                chunks.append(chunk)
+            yield chunk
+
+        sources = tool_session.sources
+
+        if session_id:
+            self.session_manager.add_exchange(session_id, query, "".join(chunks))
+
+        return sources
+
     def get_course_analytics(self) -> Dict:
         """Get analytics about the course catalog"""
         return {
@@ -1,5 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 from vector_store import SearchResults, VectorStore
 
@@ -17,6 +18,10 @@ class Tool(ABC):
         """Execute the tool with given parameters"""
         pass
 
+    def execute_with_sources(self, **kwargs) -> Tuple[str, List[Dict[str, Any]]]:
+        """Execute the tool and return its result together with the sources it used"""
+        return self.execute(**kwargs), []
+
 
 class CourseSearchTool(Tool):
     """Tool for searching course content with semantic course name matching"""
@@ -64,6 +69,31 @@ class CourseSearchTool(Tool):
         Returns:
             Formatted search results or error message
         """
+        result, sources = self.execute_with_sources(query, course_name, lesson_number)
+
+        # Only a search that found something replaces the previous sources
+        if sources:
+            self.last_sources = sources
+
+        return result
+
+    def execute_with_sources(
+        self, query: str, course_name: Optional[str] = None, lesson_number: Optional[int] = None
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Execute the search and return its sources instead of storing them on the tool.
+
+        The tool is shared by every request, so concurrent queries use this to keep their
+        sources apart (see ToolSession).
+
+        Args:
+            query: What to search for
+            course_name: Optional course filter
+            lesson_number: Optional lesson filter
+
+        Returns:
+            Tuple of (formatted search results or error message, sources list)
+        """
 
         # Use the vector store's unified search interface
         results = self.store.search(
@@ -72,7 +102,7 @@ class CourseSearchTool(Tool):
 
         # Handle errors
         if results.error:
-            return results.error
+            return results.error, []
 
         # Handle empty results
         if results.is_empty():
@@ -81,13 +111,13 @@ class CourseSearchTool(Tool):
                 filter_info += f" in course '{course_name}'"
             if lesson_number:
                 filter_info += f" in lesson {lesson_number}"
-            return f"No relevant content found{filter_info}."
+            return f"No relevant content found{filter_info}.", []
 
         # Format and return results
         return self._format_results(results)
 
-    def _format_results(self, results: SearchResults) -> str:
-        """Format search results with course and lesson context"""
+    def _format_results(self, results: SearchResults) -> Tuple[str, List[Dict[str, Any]]]:
+        """Format search results with course and lesson context, returning their sources"""
         formatted = []
         sources = []  # Track sources for the UI (with links)
 
@@ -118,10 +148,7 @@ class CourseSearchTool(Tool):
 
             formatted.append(f"{header}\n{doc}")
 
-        # Store sources for retrieval
-        self.last_sources = sources
-
-        return "\n\n".join(formatted)
+        return "\n\n".join(formatted), sources
 
 
 class CourseOutlineTool(Tool):
@@ -207,6 +234,7 @@ class ToolManager:
 
     def __init__(self):
         self.tools = {}
+        self._tool_definitions = None  # Built on first use, reset when tools change
 
     def register_tool(self, tool: Tool):
         """Register any tool that implements the Tool interface"""
@@ -215,10 +243,18 @@ class ToolManager:
         if not tool_name:
             raise ValueError("Tool must have a 'name' in its definition")
         self.tools[tool_name] = tool
+        self._tool_definitions = None
 
     def get_tool_definitions(self) -> list:
-        """Get all tool definitions for Anthropic tool calling"""
-        return [tool.get_tool_definition() for tool in self.tools.values()]
+        """
+        Get all tool definitions for Anthropic tool calling.
+
+        The same list is returned until another tool is registered, which lets the AI
+        generator reuse its serialized form. Callers must not modify it.
+        """
+        if self._tool_definitions is None:
+            self._tool_definitions = [tool.get_tool_definition() for tool in self.tools.values()]
+        return self._tool_definitions
 
     def execute_tool(self, tool_name: str, **kwargs) -> str:
         """Execute a tool by name with given parameters"""
@@ -227,6 +263,17 @@ class ToolManager:
 
         return self.tools[tool_name].execute(**kwargs)
 
+    def execute_tool_with_sources(self, tool_name: str, **kwargs) -> Tuple[str, List[Dict]]:
+        """Execute a tool by name, returning its result and the sources it used"""
+        if tool_name not in self.tools:
+            return f"Tool '{tool_name}' not found", []
+
+        return self.tools[tool_name].execute_with_sources(**kwargs)
+
+    def start_query(self) -> "ToolSession":
+        """Start collecting the tool calls and sources of a single query"""
+        return ToolSession(self)
+
     def get_last_sources(self) -> list:
         """Get sources from the last search operation"""
         # Check all tools for last_sources attribute
@@ -240,3 +287,29 @@ class ToolManager:
         for tool in self.tools.values():
             if hasattr(tool, "last_sources"):
                 tool.last_sources = []
+
+
+class ToolSession:
+    """
+    One query's view of a ToolManager.
+
+    Tools are shared by all requests, so instead of reading last_sources back afterwards
+    each query passes its own session as the tool manager and collects the sources returned
+    by every tool call it makes. Calls from one response may run on several threads.
+    """
+
+    def __init__(self, tool_manager: ToolManager):
+        self.tool_manager = tool_manager
+        self.sources: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def get_tool_definitions(self) -> list:
+        """Get all tool definitions for Anthropic tool calling"""
+        return self.tool_manager.get_tool_definitions()
+
+    def execute_tool(self, tool_name: str, **kwargs) -> str:
+        """Execute a tool by name, recording the sources it used"""
+        result, sources = self.tool_manager.execute_tool_with_sources(tool_name, **kwargs)
+        with self._lock:
+            self.sources.extend(sources)
+        return result
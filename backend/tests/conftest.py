@@ -9,76 +9,131 @@ This module provides reusable fixtures for:
 - Sample test data
 """
 
-import pytest
+import hashlib
 import os
-import sys
-import tempfile
 import shutil
-from typing import Generator
-from unittest.mock import Mock, patch
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import tempfile
+from functools import lru_cache
+from unittest.mock import Mock
 
+import chromadb
+import pytest
 from config import Config
-from vector_store import VectorStore
 from document_processor import DocumentProcessor
 from rag_system import RAGSystem
+from tests.fixtures.fake_vector_store import InMemoryVectorStore
+from vector_store import VectorStore
 
 
-@pytest.fixture
-def temp_db_path() -> Generator[str, None, None]:
-    """Create a temporary database directory that's cleaned up after test"""
-    temp_dir = tempfile.mkdtemp()
-    yield temp_dir
-    shutil.rmtree(temp_dir)
+@pytest.fixture(scope="session")
+def temp_db_path(tmp_path_factory) -> str:
+    """Create a temporary database directory (pytest prunes old runs' temp dirs in bulk)"""
+    return str(tmp_path_factory.mktemp("chroma"))
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_config(temp_db_path: str) -> Config:
-    """Create test configuration with temporary database"""
+    """Create test configuration with temporary database (shared, treat as read-only)"""
     config = Config()
     config.CHROMA_PATH = temp_db_path
     return config
 
 
 @pytest.fixture
-def empty_vector_store(test_config: Config) -> VectorStore:
-    """Create an empty vector store for testing"""
-    return VectorStore(
-        test_config.CHROMA_PATH,
-        test_config.EMBEDDING_MODEL,
-        test_config.MAX_RESULTS
-    )
+def empty_vector_store(test_config: Config, tmp_path) -> VectorStore:
+    """Create an empty vector store in its own temporary directory for testing"""
+    # The session database directory holds the sample course, so use the test's own one
+    return VectorStore(str(tmp_path), test_config.EMBEDDING_MODEL, test_config.MAX_RESULTS)
 
 
 @pytest.fixture
 def document_processor(test_config: Config) -> DocumentProcessor:
     """Create a document processor with test configuration"""
-    return DocumentProcessor(
-        test_config.CHUNK_SIZE,
-        test_config.CHUNK_OVERLAP
-    )
+    return DocumentProcessor(test_config.CHUNK_SIZE, test_config.CHUNK_OVERLAP)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_course_path() -> str:
     """Return path to sample course fixture"""
-    return os.path.join(
-        os.path.dirname(__file__),
-        'fixtures',
-        'sample_course.txt'
+    return os.path.join(os.path.dirname(__file__), "fixtures", "sample_course.txt")
+
+
+@pytest.fixture(scope="session")
+def golden_db_path(request, tmp_path_factory, test_config: Config, sample_course_path: str) -> str:
+    """
+    Return a ChromaDB directory with the sample course already embedded
+
+    The directory lives in the pytest cache, keyed by a hash of the sample course, the
+    embedding settings and the ChromaDB version (its on-disk format can change between
+    releases), so later runs skip embedding until one of them changes. Tests
+    never open it directly; fixtures copy it instead.
+    """
+    digest = hashlib.sha256()
+    with open(sample_course_path, "rb") as f:
+        digest.update(f.read())
+    settings = (
+        f"{test_config.EMBEDDING_MODEL}:{test_config.CHUNK_SIZE}:{test_config.CHUNK_OVERLAP}"
+        f":{chromadb.__version__}"
+    )
+    digest.update(settings.encode())
+
+    # Fall back to the session temp dir when the cache plugin is disabled
+    cache = getattr(request.config, "cache", None)
+    if cache is not None:
+        cache_root = str(cache.mkdir("golden_db"))
+    else:
+        cache_root = str(tmp_path_factory.getbasetemp())
+    golden_dir = os.path.join(cache_root, digest.hexdigest()[:16])
+
+    if not os.path.isdir(golden_dir):
+        # Build beside the final path and rename into place so no worker sees a half-built DB
+        build_dir = tempfile.mkdtemp(dir=cache_root)
+        processor = DocumentProcessor(test_config.CHUNK_SIZE, test_config.CHUNK_OVERLAP)
+        store = VectorStore(build_dir, test_config.EMBEDDING_MODEL, test_config.MAX_RESULTS)
+
+        # Load sample course
+        course, chunks = processor.process_course_document(sample_course_path)
+        store.add_course_metadata(course)
+        store.add_course_content(chunks)
+
+        # Drop the build-time store before its directory moves; nothing reopens build_dir
+        del store
+
+        try:
+            os.rename(build_dir, golden_dir)
+        except OSError:
+            # Another worker got there first; keep its copy
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    return golden_dir
+
+
+@pytest.fixture(scope="session")
+def vector_store_with_data(test_config: Config, golden_db_path: str) -> VectorStore:
+    """
+    Create vector store pre-loaded with sample course data
+
+    Opened once per session on a copy of the golden database, so the sample course is
+    never re-embedded, and search results are memoized per (query, filters). Tests must
+    only read from it (search, counts, titles); use empty_vector_store to write.
+    """
+    shutil.copytree(golden_db_path, test_config.CHROMA_PATH, dirs_exist_ok=True)
+    store = VectorStore(
+        test_config.CHROMA_PATH, test_config.EMBEDDING_MODEL, test_config.MAX_RESULTS
     )
 
+    # The store never changes during the session, so repeat searches are served from memory.
+    # Cached on this instance only, so empty and fresh stores are unaffected.
+    store.search = lru_cache(maxsize=None)(store.search)
+    return store
 
-@pytest.fixture
-def vector_store_with_data(test_config: Config, sample_course_path: str) -> VectorStore:
-    """Create vector store pre-loaded with sample course data"""
-    # Initialize components
+
+@pytest.fixture(scope="session")
+def fake_store(test_config: Config, sample_course_path: str) -> InMemoryVectorStore:
+    """Create an in-memory fake store loaded with the sample course (no ChromaDB/embeddings)"""
     processor = DocumentProcessor(test_config.CHUNK_SIZE, test_config.CHUNK_OVERLAP)
-    store = VectorStore(test_config.CHROMA_PATH, test_config.EMBEDDING_MODEL, test_config.MAX_RESULTS)
+    store = InMemoryVectorStore(test_config.MAX_RESULTS)
 
-    # Load sample course
     course, chunks = processor.process_course_document(sample_course_path)
     store.add_course_metadata(course)
     store.add_course_content(chunks)
@@ -101,22 +156,19 @@ def mock_rag_system(test_config: Config) -> Mock:
         [
             {
                 "text": "Introduction to Machine Learning - Lesson 0: Overview",
-                "link": "https://example.com/course/lesson0"
+                "link": "https://example.com/course/lesson0",
             },
             {
                 "text": "Introduction to Machine Learning - Lesson 1: Supervised Learning",
-                "link": "https://example.com/course/lesson1"
-            }
-        ]
+                "link": "https://example.com/course/lesson1",
+            },
+        ],
     )
 
     # Mock course analytics
     mock_system.get_course_analytics.return_value = {
         "total_courses": 2,
-        "course_titles": [
-            "Introduction to Machine Learning",
-            "Deep Learning Fundamentals"
-        ]
+        "course_titles": ["Introduction to Machine Learning", "Deep Learning Fundamentals"],
     }
 
     return mock_system
@@ -129,10 +181,7 @@ def mock_empty_rag_system(test_config: Config) -> Mock:
 
     mock_system.session_manager.create_session.return_value = "test-session-id"
     mock_system.query.return_value = ("No relevant content found.", [])
-    mock_system.get_course_analytics.return_value = {
-        "total_courses": 0,
-        "course_titles": []
-    }
+    mock_system.get_course_analytics.return_value = {"total_courses": 0, "course_titles": []}
 
     return mock_system
 
@@ -140,18 +189,13 @@ def mock_empty_rag_system(test_config: Config) -> Mock:
 @pytest.fixture
 def sample_query_request() -> dict:
     """Sample query request payload for API testing"""
-    return {
-        "query": "What is supervised learning?",
-        "session_id": "test-session-123"
-    }
+    return {"query": "What is supervised learning?", "session_id": "test-session-123"}
 
 
 @pytest.fixture
 def sample_query_request_no_session() -> dict:
     """Sample query request without session ID"""
-    return {
-        "query": "Explain neural networks"
-    }
+    return {"query": "Explain neural networks"}
 
 
 @pytest.fixture
@@ -170,7 +214,7 @@ def mock_tool_manager():
     mock.get_last_sources.return_value = [
         {
             "text": "Introduction to Machine Learning - Lesson 2",
-            "link": "https://example.com/course/lesson2"
+            "link": "https://example.com/course/lesson2",
         }
     ]
     mock.reset_sources.return_value = None
@@ -180,9 +224,10 @@ def mock_tool_manager():
 # Pytest markers for categorizing tests
 def pytest_configure(config):
     """Configure custom pytest markers"""
+    config.addinivalue_line("markers", "integration: mark test as an integration test")
+    config.addinivalue_line("markers", "unit: mark test as a unit test")
     config.addinivalue_line(
-        "markers", "integration: mark test as an integration test"
-    )
-    config.addinivalue_line(
-        "markers", "unit: mark test as a unit test"
+        "markers", "slow: mark test as slow (real ChromaDB and embedding model)"
     )
+    config.addinivalue_line("markers", "network: mark test as calling a real external API")
+    config.addinivalue_line("markers", "bedrock: mark test as calling the real Bedrock API")
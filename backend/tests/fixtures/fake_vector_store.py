@@ -0,0 +1,133 @@
+"""
+In-memory stand-in for VectorStore
+
+Tests that only exercise tool formatting, routing and source tracking don't need real
+semantic search. This fake ranks chunks by lowercase token overlap with the query, so it
+is deterministic and never loads ChromaDB or an embedding model.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from models import Course, CourseChunk
+from vector_store import SearchResults
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> Set[str]:
+    """Lowercase word tokens used for overlap scoring"""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+class InMemoryVectorStore:
+    """Dict-backed fake exposing the VectorStore methods the search tools use"""
+
+    def __init__(self, max_results: int = 5):
+        self.max_results = max_results
+        self._courses: Dict[str, Course] = {}
+        self._chunks: List[CourseChunk] = []
+
+    def add_course_metadata(self, course: Course):
+        """Add course information to the catalog"""
+        self._courses[course.title] = course
+
+    def add_course_content(self, chunks: List[CourseChunk]):
+        """Add course content chunks to the store"""
+        self._chunks.extend(chunks)
+
+    def search(
+        self,
+        query: str,
+        course_name: Optional[str] = None,
+        lesson_number: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SearchResults:
+        """Return the chunks sharing the most tokens with query, honouring the filters"""
+        course_title = None
+        if course_name:
+            course_title = self._resolve_course_name(course_name)
+            if not course_title:
+                return SearchResults.empty(f"No course found matching '{course_name}'")
+
+        query_tokens = _tokens(query)
+        scored = []
+        for chunk in self._chunks:
+            if course_title and chunk.course_title != course_title:
+                continue
+            if lesson_number is not None and chunk.lesson_number != lesson_number:
+                continue
+            overlap = len(query_tokens & _tokens(chunk.content))
+            if overlap:
+                scored.append((overlap, chunk))
+
+        # Stable sort keeps document order between equally scored chunks
+        scored.sort(key=lambda item: item[0], reverse=True)
+        search_limit = limit if limit is not None else self.max_results
+        top = scored[:search_limit]
+
+        return SearchResults(
+            documents=[chunk.content for _, chunk in top],
+            metadata=[
+                {
+                    "course_title": chunk.course_title,
+                    "lesson_number": chunk.lesson_number,
+                    "chunk_index": chunk.chunk_index,
+                }
+                for _, chunk in top
+            ],
+            distances=[1.0 / overlap for overlap, _ in top],
+        )
+
+    def _resolve_course_name(self, course_name: str) -> Optional[str]:
+        """Find the course title sharing the most tokens with course_name"""
+        name_tokens = _tokens(course_name)
+        best_title, best_overlap = None, 0
+        for title in self._courses:
+            overlap = len(name_tokens & _tokens(title))
+            if overlap > best_overlap:
+                best_title, best_overlap = title, overlap
+        return best_title
+
+    def get_existing_course_titles(self) -> List[str]:
+        """Get all existing course titles"""
+        return list(self._courses)
+
+    def get_course_count(self) -> int:
+        """Get the total number of courses"""
+        return len(self._courses)
+
+    def get_course_link(self, course_title: str) -> Optional[str]:
+        """Get course link for a given course title"""
+        course = self._courses.get(course_title)
+        return course.course_link if course else None
+
+    def get_lesson_link(self, course_title: str, lesson_number: int) -> Optional[str]:
+        """Get lesson link for a given course title and lesson number"""
+        course = self._courses.get(course_title)
+        if course:
+            for lesson in course.lessons:
+                if lesson.lesson_number == lesson_number:
+                    return lesson.lesson_link
+        return None
+
+    def get_course_outline(self, course_name: str) -> Optional[Dict[str, Any]]:
+        """Get full course outline in the same shape as VectorStore.get_course_outline"""
+        course_title = self._resolve_course_name(course_name)
+        if not course_title:
+            return None
+
+        course = self._courses[course_title]
+        return {
+            "course_title": course.title,
+            "course_link": course.course_link,
+            "instructor": course.instructor,
+            "lessons": [
+                {
+                    "lesson_number": lesson.lesson_number,
+                    "lesson_title": lesson.title,
+                    "lesson_link": lesson.lesson_link,
+                }
+                for lesson in course.lessons
+            ],
+        }
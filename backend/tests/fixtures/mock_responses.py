@@ -1,114 +1,193 @@
-"""Mock Bedrock API responses for testing"""
+"""Mock Bedrock API responses for testing
+
+The canned responses are shared module-level dicts; tests must not mutate them.
+"""
+
+import io
+import json
+from typing import Any
+
+try:
+    import orjson
+
+    # Same encoder as ai_generator: UTF-8 bytes straight from the C extension
+    _dumps = orjson.dumps
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
+_TOOL_USE_RESPONSE = {
+    "stop_reason": "tool_use",
+    "content": [
+        {
+            "type": "text",
+            "text": "I need to search the course content to answer this question.",
+        },
+        {
+            "type": "tool_use",
+            "id": "toolu_123456",
+            "name": "search_course_content",
+            "input": {"query": "supervised learning", "course_name": "Machine Learning"},
+        },
+    ],
+}
 
 
 def get_mock_tool_use_response():
     """Returns a mock Bedrock response where Claude decides to use a tool"""
-    return {
-        "stop_reason": "tool_use",
-        "content": [
-            {
-                "type": "text",
-                "text": "I need to search the course content to answer this question.",
-            },
-            {
-                "type": "tool_use",
-                "id": "toolu_123456",
-                "name": "search_course_content",
-                "input": {"query": "supervised learning", "course_name": "Machine Learning"},
-            },
-        ],
-    }
+    return _TOOL_USE_RESPONSE
+
+
+_TOOL_USE_ROUND2_RESPONSE = {
+    "stop_reason": "tool_use",
+    "content": [
+        {
+            "type": "text",
+            "text": "Based on the first search, I need to search another course for comparison.",
+        },
+        {
+            "type": "tool_use",
+            "id": "toolu_789012",
+            "name": "search_course_content",
+            "input": {"query": "neural networks", "course_name": "Deep Learning"},
+        },
+    ],
+}
 
 
 def get_mock_tool_use_response_round2():
     """Returns a mock Bedrock response for second round tool use"""
-    return {
-        "stop_reason": "tool_use",
-        "content": [
-            {
-                "type": "text",
-                "text": "Based on the first search, I need to search another course for comparison.",
-            },
-            {
-                "type": "tool_use",
-                "id": "toolu_789012",
-                "name": "search_course_content",
-                "input": {"query": "neural networks", "course_name": "Deep Learning"},
-            },
-        ],
-    }
+    return _TOOL_USE_ROUND2_RESPONSE
+
+
+_TOOL_USE_OUTLINE_RESPONSE = {
+    "stop_reason": "tool_use",
+    "content": [
+        {"type": "text", "text": "I need to get the course outline first."},
+        {
+            "type": "tool_use",
+            "id": "toolu_345678",
+            "name": "get_course_outline",
+            "input": {"course_title": "Machine Learning"},
+        },
+    ],
+}
 
 
 def get_mock_tool_use_response_outline():
     """Returns a mock Bedrock response using get_course_outline tool"""
-    return {
-        "stop_reason": "tool_use",
-        "content": [
-            {"type": "text", "text": "I need to get the course outline first."},
-            {
-                "type": "tool_use",
-                "id": "toolu_345678",
-                "name": "get_course_outline",
-                "input": {"course_title": "Machine Learning"},
-            },
-        ],
-    }
+    return _TOOL_USE_OUTLINE_RESPONSE
+
+
+_TOOL_USE_ROUND3_RESPONSE = {
+    "stop_reason": "tool_use",
+    "content": [
+        {"type": "text", "text": "I would like to search again but should be at max rounds."},
+        {
+            "type": "tool_use",
+            "id": "toolu_999999",
+            "name": "search_course_content",
+            "input": {"query": "third search attempt", "course_name": "Test"},
+        },
+    ],
+}
 
 
 def get_mock_tool_use_response_round3():
     """Returns a mock Bedrock response for what would be a third round (should not execute)"""
-    return {
-        "stop_reason": "tool_use",
-        "content": [
-            {"type": "text", "text": "I would like to search again but should be at max rounds."},
-            {
-                "type": "tool_use",
-                "id": "toolu_999999",
-                "name": "search_course_content",
-                "input": {"query": "third search attempt", "course_name": "Test"},
-            },
-        ],
-    }
+    return _TOOL_USE_ROUND3_RESPONSE
+
+
+_FINAL_RESPONSE = {
+    "stop_reason": "end_turn",
+    "content": [
+        {
+            "type": "text",
+            "text": "Supervised learning is a type of machine learning where algorithms learn from labeled training data with input features and output labels.",
+        }
+    ],
+}
 
 
 def get_mock_final_response():
     """Returns a mock Bedrock response with the final answer after tool use"""
-    return {
-        "stop_reason": "end_turn",
-        "content": [
-            {
-                "type": "text",
-                "text": "Supervised learning is a type of machine learning where algorithms learn from labeled training data with input features and output labels.",
-            }
-        ],
-    }
+    return _FINAL_RESPONSE
+
+
+_DIRECT_RESPONSE = {
+    "stop_reason": "end_turn",
+    "content": [
+        {
+            "type": "text",
+            "text": "This is a general knowledge answer that doesn't require searching course content.",
+        }
+    ],
+}
 
 
 def get_mock_direct_response():
     """Returns a mock Bedrock response for questions that don't need tools"""
-    return {
-        "stop_reason": "end_turn",
-        "content": [
-            {
-                "type": "text",
-                "text": "This is a general knowledge answer that doesn't require searching course content.",
-            }
-        ],
-    }
+    return _DIRECT_RESPONSE
+
+
+# The most used mock responses never change, so encode them once at import for the
+# get_mock_*_bedrock() helpers below
+_TOOL_USE_BYTES = _dumps(_TOOL_USE_RESPONSE)
+_FINAL_BYTES = _dumps(_FINAL_RESPONSE)
+_DIRECT_BYTES = _dumps(_DIRECT_RESPONSE)
+
+
+def _bedrock_body(encoded: bytes):
+    """Wrap an encoded response body like invoke_model's return value"""
+    # Like botocore's StreamingBody, the buffer can only be read once
+    return {"body": io.BytesIO(encoded)}
 
 
 def get_mock_bedrock_response_bytes(response_dict):
     """Convert response dict to Bedrock-style response with body.read()"""
-    import io
-    import json
+    return _bedrock_body(_dumps(response_dict))
+
+
+def get_mock_tool_use_bedrock():
+    """Bedrock-style response for get_mock_tool_use_response()"""
+    return _bedrock_body(_TOOL_USE_BYTES)
+
+
+def get_mock_final_bedrock():
+    """Bedrock-style response for get_mock_final_response()"""
+    return _bedrock_body(_FINAL_BYTES)
+
+
+def get_mock_direct_bedrock():
+    """Bedrock-style response for get_mock_direct_response()"""
+    return _bedrock_body(_DIRECT_BYTES)
+
+
+def get_mock_bedrock_stream_response(response_dict):
+    """Convert response dict to Bedrock-style streaming response with chunk events"""
+    events = [{"type": "message_start", "message": {"role": "assistant", "content": []}}]
 
-    class MockBody:
-        def __init__(self, data):
-            self.data = data
+    for index, block in enumerate(response_dict["content"]):
+        if block["type"] == "text":
+            start = {"type": "text", "text": ""}
+            # Split text into two deltas to exercise incremental streaming
+            middle = len(block["text"]) // 2
+            deltas = [
+                {"type": "text_delta", "text": block["text"][:middle]},
+                {"type": "text_delta", "text": block["text"][middle:]},
+            ]
+        else:
+            start = {"type": "tool_use", "id": block["id"], "name": block["name"], "input": {}}
+            deltas = [{"type": "input_json_delta", "partial_json": json.dumps(block["input"])}]
 
-        def read(self):
-            import json
+        events.append({"type": "content_block_start", "index": index, "content_block": start})
+        for delta in deltas:
+            events.append({"type": "content_block_delta", "index": index, "delta": delta})
+        events.append({"type": "content_block_stop", "index": index})
 
-            return json.dumps(self.data).encode("utf-8")
+    events.append({"type": "message_delta", "delta": {"stop_reason": response_dict["stop_reason"]}})
+    events.append({"type": "message_stop"})
 
-    return {"body": MockBody(response_dict)}
+    return {"body": [{"chunk": {"bytes": _dumps(event)}} for event in events]}
@@ -9,464 +9,666 @@ These tests verify that AIGenerator correctly:
 5. Handles errors gracefully
 """
 
-import json
-import os
-import sys
 from unittest.mock import MagicMock, Mock, patch
 
+import orjson
 import pytest
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from ai_generator import AIGenerator
+from ai_generator import DISCARD_TEXT, AIGenerator, _get_bedrock_client
 from tests.fixtures.mock_responses import (
     get_mock_bedrock_response_bytes,
+    get_mock_bedrock_stream_response,
+    get_mock_direct_bedrock,
     get_mock_direct_response,
+    get_mock_final_bedrock,
     get_mock_final_response,
+    get_mock_tool_use_bedrock,
     get_mock_tool_use_response,
     get_mock_tool_use_response_outline,
     get_mock_tool_use_response_round2,
     get_mock_tool_use_response_round3,
 )
 
+# Tool definitions passed to generate_response; AIGenerator only serializes them, never mutates
+SEARCH_TOOLS = ({"name": "search_course_content"},)
+SEARCH_AND_OUTLINE_TOOLS = (
+    {"name": "search_course_content", "description": "Search"},
+    {"name": "get_course_outline", "description": "Get outline"},
+)
 
-class TestAIGeneratorToolCalling:
-    """Test AIGenerator's tool calling orchestration"""
-
-    def create_mock_ai_generator(self):
-        """Helper to create AIGenerator with mocked Bedrock client"""
-        with patch("boto3.client"):
-            ai_gen = AIGenerator(
-                aws_access_key_id="test_key",
-                aws_secret_access_key="test_secret",
-                aws_session_token="test_token",
-                aws_region="us-east-1",
-                model_id="test-model",
-            )
-            ai_gen.client = Mock()
-            return ai_gen
-
-    def test_direct_response_without_tools(self):
-        """Test response when Claude doesn't use tools"""
-        ai_gen = self.create_mock_ai_generator()
-
-        # Mock Bedrock response
-        mock_response = get_mock_direct_response()
-        ai_gen.client.invoke_model.return_value = get_mock_bedrock_response_bytes(mock_response)
-
-        # Call without tools
-        result = ai_gen.generate_response(query="What is 2+2?", tools=None, tool_manager=None)
-
-        # Verify single API call
-        assert ai_gen.client.invoke_model.call_count == 1
-        assert (
-            result
-            == "This is a general knowledge answer that doesn't require searching course content."
-        )
-
-    def test_tool_use_triggers_execution(self):
-        """Test that tool_use stop_reason triggers tool execution flow"""
-        ai_gen = self.create_mock_ai_generator()
-
-        # Mock two responses: tool_use then final
-        tool_use_response = get_mock_tool_use_response()
-        final_response = get_mock_final_response()
-
-        ai_gen.client.invoke_model.side_effect = [
-            get_mock_bedrock_response_bytes(tool_use_response),
-            get_mock_bedrock_response_bytes(final_response),
-        ]
-
-        # Mock tool manager
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = (
-            "[ML Course] Supervised learning uses labeled data."
-        )
-
-        # Mock tools list
-        tools = [{"name": "search_course_content", "description": "Search courses"}]
 
-        # Execute
-        result = ai_gen.generate_response(
-            query="What is supervised learning?", tools=tools, tool_manager=mock_tool_manager
-        )
+def make_capturing_side_effect(responses):
+    """
+    Build an invoke_model side_effect that records each raw request body.
 
-        # Verify tool was executed
-        mock_tool_manager.execute_tool.assert_called_once_with(
-            "search_course_content", query="supervised learning", course_name="Machine Learning"
-        )
+    Args:
+        responses: Mock response dicts returned in call order; the last one repeats
 
-        # Verify two API calls
-        assert ai_gen.client.invoke_model.call_count == 2
+    Returns:
+        Tuple of (list the request bodies are appended to, side_effect callable)
+    """
+    captured_bodies = []
 
-        # Verify final response
-        assert "Supervised learning is a type of machine learning" in result
+    def capture_invoke(body, **invoke_kwargs):
+        captured_bodies.append(body)
+        index = min(len(captured_bodies), len(responses)) - 1
+        return get_mock_bedrock_response_bytes(responses[index])
 
-    def test_tool_results_added_to_messages(self):
-        """Test tool results are correctly added to message history"""
-        ai_gen = self.create_mock_ai_generator()
+    return captured_bodies, capture_invoke
 
-        tool_use_response = get_mock_tool_use_response()
-        final_response = get_mock_final_response()
 
-        captured_requests = []
+@pytest.fixture(scope="session")
+def _ai_gen_base():
+    """One AIGenerator for the whole run; ai_gen resets its per-test state"""
+    return AIGenerator(
+        aws_access_key_id="test_key",
+        aws_secret_access_key="test_secret",
+        aws_session_token="test_token",
+        aws_region="us-east-1",
+        model_id="test-model",
+    )
 
-        def capture_invoke(modelId, body):
-            captured_requests.append(json.loads(body))
-            if len(captured_requests) == 1:
-                return get_mock_bedrock_response_bytes(tool_use_response)
-            return get_mock_bedrock_response_bytes(final_response)
 
-        ai_gen.client.invoke_model.side_effect = capture_invoke
+@pytest.fixture
+def ai_gen(_ai_gen_base):
+    """Shared AIGenerator with a fresh mocked Bedrock client and empty response cache"""
+    # The real client is only built on first access, so assigning a mock is enough
+    _ai_gen_base.client = Mock()
+    _ai_gen_base.response_cache.clear()
+    _ai_gen_base.short_circuit_empty_tools = False
+    return _ai_gen_base
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "Tool result content"
 
-        tools = [{"name": "search_course_content"}]
+@pytest.fixture
+def mock_tool_manager():
+    """Tool manager stub limited to the interface AIGenerator calls"""
+    return Mock(spec=["execute_tool"])
 
-        ai_gen.generate_response(query="Test query", tools=tools, tool_manager=mock_tool_manager)
 
-        # Verify second request has correct message structure
-        assert len(captured_requests) == 2
-        second_request = captured_requests[1]
+def test_direct_response_without_tools(ai_gen):
+    """Test response when Claude doesn't use tools"""
+    # Mock Bedrock response from the pre-encoded direct answer
+    ai_gen.client.invoke_model.return_value = get_mock_direct_bedrock()
 
-        # Should have 3 messages: user, assistant (with tool_use), user (with tool_result)
-        assert len(second_request["messages"]) == 3
-        assert second_request["messages"][0]["role"] == "user"
-        assert second_request["messages"][1]["role"] == "assistant"
-        assert second_request["messages"][2]["role"] == "user"
+    # Call without tools
+    result = ai_gen.generate_response(query="What is 2+2?", tools=None, tool_manager=None)
 
-        # Check tool result structure
-        tool_result_content = second_request["messages"][2]["content"]
-        assert isinstance(tool_result_content, list)
-        assert tool_result_content[0]["type"] == "tool_result"
-        assert tool_result_content[0]["content"] == "Tool result content"
+    # Verify single API call
+    assert ai_gen.client.invoke_model.call_count == 1
+    assert (
+        result
+        == "This is a general knowledge answer that doesn't require searching course content."
+    )
 
-    def test_no_tool_execution_without_tool_manager(self):
-        """Test that tool_use without tool_manager returns gracefully"""
-        ai_gen = self.create_mock_ai_generator()
 
-        tool_use_response = get_mock_tool_use_response()
-        ai_gen.client.invoke_model.return_value = get_mock_bedrock_response_bytes(tool_use_response)
+def test_tool_use_triggers_execution(ai_gen, mock_tool_manager):
+    """Test that tool_use stop_reason triggers tool execution flow"""
+    # Mock two responses: tool_use then final
+    ai_gen.client.invoke_model.side_effect = [get_mock_tool_use_bedrock(), get_mock_final_bedrock()]
 
-        # Call with tools but no tool_manager
-        result = ai_gen.generate_response(
-            query="Test", tools=[{"name": "search_course_content"}], tool_manager=None
-        )
+    # Mock tool manager
+    mock_tool_manager.execute_tool.return_value = (
+        "[ML Course] Supervised learning uses labeled data."
+    )
 
-        # Should return text from first response (won't execute tool)
-        assert result == "I need to search the course content to answer this question."
+    # Mock tools list
+    # Execute
+    result = ai_gen.generate_response(
+        query="What is supervised learning?", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+    )
 
-    def test_conversation_history_included(self):
-        """Test conversation history is included in system prompt"""
-        ai_gen = self.create_mock_ai_generator()
+    # Verify tool was executed
+    mock_tool_manager.execute_tool.assert_called_once_with(
+        "search_course_content", query="supervised learning", course_name="Machine Learning"
+    )
 
-        direct_response = get_mock_direct_response()
+    # Verify two API calls
+    assert ai_gen.client.invoke_model.call_count == 2
 
-        captured_requests = []
+    # Verify final response
+    assert "Supervised learning is a type of machine learning" in result
 
-        def capture_invoke(modelId, body):
-            captured_requests.append(json.loads(body))
-            return get_mock_bedrock_response_bytes(direct_response)
 
-        ai_gen.client.invoke_model.side_effect = capture_invoke
+def test_tool_results_added_to_messages(ai_gen, mock_tool_manager):
+    """Test tool results are correctly added to message history"""
+    tool_use_response = get_mock_tool_use_response()
+    final_response = get_mock_final_response()
 
-        ai_gen.generate_response(
-            query="New question",
-            conversation_history="User: Previous question\nAssistant: Previous answer",
-        )
+    captured_bodies, capture_invoke = make_capturing_side_effect(
+        [tool_use_response, final_response]
+    )
+    ai_gen.client.invoke_model.side_effect = capture_invoke
 
-        # Verify history in system prompt
-        assert len(captured_requests) == 1
-        system_content = captured_requests[0]["system"]
-        assert "Previous conversation:" in system_content
-        assert "Previous question" in system_content
-        assert "Previous answer" in system_content
+    mock_tool_manager.execute_tool.return_value = "Tool result content"
 
-    def test_tools_added_to_request(self):
-        """Test tools are properly added to API request"""
-        ai_gen = self.create_mock_ai_generator()
+    ai_gen.generate_response(query="Test query", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager)
 
-        direct_response = get_mock_direct_response()
+    # Verify second request has correct message structure
+    assert len(captured_bodies) == 2
+    second_request = orjson.loads(captured_bodies[1])
 
-        captured_requests = []
+    # Should have 3 messages: user, assistant (with tool_use), user (with tool_result)
+    assert len(second_request["messages"]) == 3
+    assert second_request["messages"][0]["role"] == "user"
+    assert second_request["messages"][1]["role"] == "assistant"
+    assert second_request["messages"][2]["role"] == "user"
 
-        def capture_invoke(modelId, body):
-            captured_requests.append(json.loads(body))
-            return get_mock_bedrock_response_bytes(direct_response)
+    # Check tool result structure
+    tool_result_content = second_request["messages"][2]["content"]
+    assert isinstance(tool_result_content, list)
+    assert tool_result_content[0]["type"] == "tool_result"
+    assert tool_result_content[0]["content"] == "Tool result content"
+
+
+def test_no_tool_execution_without_tool_manager(ai_gen):
+    """Test that tool_use without tool_manager returns gracefully"""
+    ai_gen.client.invoke_model.return_value = get_mock_tool_use_bedrock()
+
+    # Call with tools but no tool_manager
+    result = ai_gen.generate_response(query="Test", tools=SEARCH_TOOLS, tool_manager=None)
+
+    # Should return text from first response (won't execute tool)
+    assert result == "I need to search the course content to answer this question."
+
+
+def test_conversation_history_included(ai_gen):
+    """Test conversation history is included in system prompt"""
+    direct_response = get_mock_direct_response()
+
+    captured_bodies, capture_invoke = make_capturing_side_effect([direct_response])
+    ai_gen.client.invoke_model.side_effect = capture_invoke
+
+    ai_gen.generate_response(
+        query="New question",
+        conversation_history="User: Previous question\nAssistant: Previous answer",
+    )
+
+    # Verify history in system prompt by scanning the raw body - no parse needed
+    assert len(captured_bodies) == 1
+    body = captured_bodies[0]
+    assert b"Previous conversation:" in body
+    assert b"Previous question" in body
+    assert b"Previous answer" in body
+
+    # History is the last system block, uncached, right after the cached static prompt block
+    history_block = (
+        b'{"type":"text","text":"Previous conversation:\\n'
+        b'User: Previous question\\nAssistant: Previous answer"}'
+    )
+    assert b'"cache_control":{"type":"ephemeral"}},' + history_block + b"]" in body
+
+
+def test_tools_added_to_request(ai_gen):
+    """Test tools are properly added to API request"""
+    direct_response = get_mock_direct_response()
+
+    captured_bodies, capture_invoke = make_capturing_side_effect([direct_response])
+    ai_gen.client.invoke_model.side_effect = capture_invoke
+
+    ai_gen.generate_response(query="Test", tools=SEARCH_AND_OUTLINE_TOOLS)
+
+    # Verify tools in request
+    assert len(captured_bodies) == 1
+    request = orjson.loads(captured_bodies[0])
+    assert "tools" in request
+    assert request["tools"] == list(SEARCH_AND_OUTLINE_TOOLS)
+    assert request["tool_choice"] == {"type": "auto"}
+
+    # Constant fields come from the pre-encoded body prefix
+    assert request["anthropic_version"] == "bedrock-2023-05-31"
+    assert request["temperature"] == 0
+    assert request["max_tokens"] == 800
+
+
+def test_second_call_includes_tools_for_potential_round2(ai_gen, mock_tool_manager):
+    """Test second API call after tool execution still includes tools (for potential round 2)"""
+    tool_use_response = get_mock_tool_use_response()
+    final_response = get_mock_final_response()
+
+    captured_bodies, capture_invoke = make_capturing_side_effect(
+        [tool_use_response, final_response]
+    )
+    ai_gen.client.invoke_model.side_effect = capture_invoke
+
+    mock_tool_manager.execute_tool.return_value = "Result"
+
+    ai_gen.generate_response(query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager)
+
+    # Presence checks only, so scan the raw bodies instead of parsing them
+    # First call should have tools
+    assert b'"tools":' in captured_bodies[0]
+
+    # Second call SHOULD have tools (round 1, can still do round 2)
+    assert b'"tools":' in captured_bodies[1]
+
+
+@pytest.mark.parametrize(
+    "responses, tool_results, expected_api_calls, expected_tool_calls, expected_text",
+    [
+        # Backward compatibility: tool_use then final answer
+        pytest.param(
+            [get_mock_tool_use_response(), get_mock_final_response()],
+            ["ML search results"],
+            2,
+            1,
+            "Supervised learning",
+            id="single_round",
+        ),
+        # tool_use -> tool_use -> final
+        pytest.param(
+            [
+                get_mock_tool_use_response(),
+                get_mock_tool_use_response_round2(),
+                get_mock_final_response(),
+            ],
+            ["ML result about supervised learning", "DL result about neural networks"],
+            3,
+            2,
+            "Supervised learning",
+            id="two_rounds",
+        ),
+        # Claude is satisfied after round 1
+        pytest.param(
+            [get_mock_tool_use_response(), get_mock_final_response()],
+            ["Sufficient results"],
+            2,
+            1,
+            "Supervised learning",
+            id="early_termination",
+        ),
+        # Claude keeps asking for tools; the third tool_use is ignored and its text returned
+        pytest.param(
+            [
+                get_mock_tool_use_response(),
+                get_mock_tool_use_response_round2(),
+                get_mock_tool_use_response_round3(),
+            ],
+            ["Result 1", "Result 2"],
+            3,
+            2,
+            "would like to search again",
+            id="max_rounds_enforced",
+        ),
+    ],
+)
+def test_sequential_tool_rounds(
+    ai_gen,
+    mock_tool_manager,
+    responses,
+    tool_results,
+    expected_api_calls,
+    expected_tool_calls,
+    expected_text,
+):
+    """Test API/tool call counts and final text for each sequential round scenario"""
+    ai_gen.client.invoke_model.side_effect = (
+        get_mock_bedrock_response_bytes(response) for response in responses
+    )
 
-        ai_gen.client.invoke_model.side_effect = capture_invoke
+    mock_tool_manager.execute_tool.side_effect = tool_results
 
-        tools = [
-            {"name": "search_course_content", "description": "Search"},
-            {"name": "get_course_outline", "description": "Get outline"},
-        ]
+    result = ai_gen.generate_response(
+        query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+    )
 
-        ai_gen.generate_response(query="Test", tools=tools)
+    assert ai_gen.client.invoke_model.call_count == expected_api_calls
+    assert mock_tool_manager.execute_tool.call_count == expected_tool_calls
+    assert expected_text in result
 
-        # Verify tools in request
-        assert len(captured_requests) == 1
-        request = captured_requests[0]
-        assert "tools" in request
-        assert request["tools"] == tools
-        assert request["tool_choice"] == {"type": "auto"}
 
-    def test_second_call_includes_tools_for_potential_round2(self):
-        """Test second API call after tool execution still includes tools (for potential round 2)"""
-        ai_gen = self.create_mock_ai_generator()
+def test_context_preserved_across_rounds(ai_gen, mock_tool_manager):
+    """Test that message history is preserved across rounds"""
+    round1_response = get_mock_tool_use_response()
+    round2_response = get_mock_tool_use_response_round2()
+    final_response = get_mock_final_response()
 
-        tool_use_response = get_mock_tool_use_response()
-        final_response = get_mock_final_response()
+    captured_bodies, capture_invoke = make_capturing_side_effect(
+        [round1_response, round2_response, final_response]
+    )
+    ai_gen.client.invoke_model.side_effect = capture_invoke
 
-        captured_requests = []
+    mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
 
-        def capture_invoke(modelId, body):
-            captured_requests.append(json.loads(body))
-            if len(captured_requests) == 1:
-                return get_mock_bedrock_response_bytes(tool_use_response)
-            return get_mock_bedrock_response_bytes(final_response)
+    ai_gen.generate_response(query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager)
 
-        ai_gen.client.invoke_model.side_effect = capture_invoke
+    # Verify message accumulation
+    assert len(captured_bodies) == 3
+    captured_requests = [orjson.loads(body) for body in captured_bodies]
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "Result"
+    # Initial call: 1 message (user query)
+    assert len(captured_requests[0]["messages"]) == 1
+    assert captured_requests[0]["messages"][0]["role"] == "user"
 
-        tools = [{"name": "search_course_content"}]
+    # After round 1: 3 messages (user + assistant + tool_results)
+    assert len(captured_requests[1]["messages"]) == 3
+    assert captured_requests[1]["messages"][0]["role"] == "user"
+    assert captured_requests[1]["messages"][1]["role"] == "assistant"
+    assert captured_requests[1]["messages"][2]["role"] == "user"
 
-        ai_gen.generate_response(query="Test", tools=tools, tool_manager=mock_tool_manager)
+    # After round 2: 5 messages
+    assert len(captured_requests[2]["messages"]) == 5
+    assert captured_requests[2]["messages"][3]["role"] == "assistant"
+    assert captured_requests[2]["messages"][4]["role"] == "user"
 
-        # First call should have tools
-        assert "tools" in captured_requests[0]
 
-        # Second call SHOULD have tools (round 1, can still do round 2)
-        assert "tools" in captured_requests[1]
+def test_tools_included_in_both_rounds(ai_gen, mock_tool_manager):
+    """Test tools are included in calls for rounds 1 and 2, but not final call"""
+    round1_response = get_mock_tool_use_response()
+    round2_response = get_mock_tool_use_response_round2()
+    round3_response = get_mock_tool_use_response_round3()
 
-    def test_single_round_still_works(self):
-        """Test that single-round tool calling still works (backward compatibility)"""
-        ai_gen = self.create_mock_ai_generator()
+    captured_bodies, capture_invoke = make_capturing_side_effect(
+        [round1_response, round2_response, round3_response]
+    )
+    ai_gen.client.invoke_model.side_effect = capture_invoke
 
-        # Mock two responses: tool_use then final
-        tool_use_response = get_mock_tool_use_response()
-        final_response = get_mock_final_response()
+    mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
 
-        ai_gen.client.invoke_model.side_effect = [
-            get_mock_bedrock_response_bytes(tool_use_response),
-            get_mock_bedrock_response_bytes(final_response),
-        ]
+    ai_gen.generate_response(query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager)
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "ML search results"
+    # Call 1 (initial): has tools
+    assert orjson.loads(captured_bodies[0])["tools"] == list(SEARCH_TOOLS)
 
-        tools = [{"name": "search_course_content"}]
+    # Call 2 (after round 1): has tools
+    assert orjson.loads(captured_bodies[1])["tools"] == list(SEARCH_TOOLS)
 
-        result = ai_gen.generate_response(
-            query="What is supervised learning?", tools=tools, tool_manager=mock_tool_manager
+    # Call 3 (after round 2, final): NO tools
+    assert b'"tools":' not in captured_bodies[2]
+
+
+def test_tool_execution_error_handling(ai_gen, mock_tool_manager):
+    """Test graceful handling when tool execution fails"""
+    ai_gen.client.invoke_model.side_effect = [get_mock_tool_use_bedrock(), get_mock_final_bedrock()]
+
+    mock_tool_manager.execute_tool.side_effect = Exception("Tool execution failed")
+
+    # Should not raise exception
+    result = ai_gen.generate_response(
+        query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+    )
+
+    # Should get final response despite tool error
+    assert result is not None
+    assert ai_gen.client.invoke_model.call_count == 2
+
+
+def test_multiple_tool_calls_in_one_response(ai_gen, mock_tool_manager):
+    """Test parallel tool_use blocks are all executed and results keep block order"""
+    outline_block = get_mock_tool_use_response_outline()["content"][1]
+    search_block = get_mock_tool_use_response()["content"][1]
+    parallel_response = {"stop_reason": "tool_use", "content": [outline_block, search_block]}
+
+    captured_bodies, capture_invoke = make_capturing_side_effect(
+        [parallel_response, get_mock_final_response()]
+    )
+    ai_gen.client.invoke_model.side_effect = capture_invoke
+
+    mock_tool_manager.execute_tool.side_effect = lambda name, **kwargs: f"{name} result"
+
+    ai_gen.generate_response(query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager)
+
+    assert mock_tool_manager.execute_tool.call_count == 2
+    tool_results = orjson.loads(captured_bodies[1])["messages"][2]["content"]
+    assert [r["tool_use_id"] for r in tool_results] == ["toolu_345678", "toolu_123456"]
+    assert [r["content"] for r in tool_results] == [
+        "get_course_outline result",
+        "search_course_content result",
+    ]
+
+
+def test_repeated_query_served_from_cache(ai_gen):
+    """Test a repeated direct-answer query skips the Bedrock call"""
+    # Response bodies can only be read once, so hand out a fresh one per call
+    ai_gen.client.invoke_model.side_effect = lambda **kwargs: get_mock_direct_bedrock()
+
+    first = ai_gen.generate_response(query="What is 2+2?")
+    second = ai_gen.generate_response(query="What is 2+2?")
+    ai_gen.generate_response(query="What is 2+2?", conversation_history="User: Hi")
+
+    assert first == second
+    # The history variant is a different cache key
+    assert ai_gen.client.invoke_model.call_count == 2
+
+
+def test_truncated_responses_not_cached(ai_gen):
+    """Test an answer cut off by max_tokens is not cached, streamed or not"""
+    truncated_response = {
+        "stop_reason": "max_tokens",
+        "content": [{"type": "text", "text": "This answer was cut o"}],
+    }
+    ai_gen.client.invoke_model.side_effect = lambda **kwargs: get_mock_bedrock_response_bytes(
+        truncated_response
+    )
+    ai_gen.client.invoke_model_with_response_stream.side_effect = (
+        lambda **kwargs: get_mock_bedrock_stream_response(truncated_response)
+    )
+
+    for _ in range(2):
+        assert ai_gen.generate_response(query="Explain") == "This answer was cut o"
+        assert "".join(ai_gen.generate_response_stream(query="Explain")) == "This answer was cut o"
+
+    assert ai_gen.client.invoke_model.call_count == 2
+    assert ai_gen.client.invoke_model_with_response_stream.call_count == 2
+
+
+def test_tool_responses_not_cached(ai_gen, mock_tool_manager):
+    """Test answers produced with tool results are not cached"""
+    ai_gen.client.invoke_model.side_effect = [
+        get_mock_tool_use_bedrock(),
+        get_mock_final_bedrock(),
+        get_mock_tool_use_bedrock(),
+        get_mock_final_bedrock(),
+    ]
+
+    mock_tool_manager.execute_tool.return_value = "Result"
+    for _ in range(2):
+        ai_gen.generate_response(query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager)
+
+    assert ai_gen.client.invoke_model.call_count == 4
+
+
+@pytest.mark.parametrize(
+    "responses,tool_results,expected_api_calls,expected_result",
+    [
+        # Nothing found in round 1: the answer states the empty result, not Claude's preamble
+        pytest.param(
+            [get_mock_tool_use_response()],
+            ["No relevant content found in course 'ML'."],
+            1,
+            "No relevant content found in course 'ML'.",
+            id="empty_round1",
+        ),
+        # Non-empty results still get their follow-up round
+        pytest.param(
+            [get_mock_tool_use_response(), get_mock_final_response()],
+            ["Lesson content"],
+            2,
+            get_mock_final_response()["content"][0]["text"],
+            id="non_empty_round1",
+        ),
+        # An empty round 2 must not discard what round 1 found
+        pytest.param(
+            [
+                get_mock_tool_use_response(),
+                get_mock_tool_use_response_round2(),
+                get_mock_final_response(),
+            ],
+            ["Lesson 1 content", "No relevant content found."],
+            3,
+            get_mock_final_response()["content"][0]["text"],
+            id="empty_round2_after_content",
+        ),
+    ],
+)
+def test_empty_tool_results_short_circuit_when_enabled(
+    ai_gen, mock_tool_manager, responses, tool_results, expected_api_calls, expected_result
+):
+    """Test the follow-up call is skipped only when round 1's tools all came back empty"""
+    ai_gen.short_circuit_empty_tools = True
+    ai_gen.client.invoke_model.side_effect = (
+        get_mock_bedrock_response_bytes(response) for response in responses
+    )
+    mock_tool_manager.execute_tool.side_effect = tool_results
+
+    result = ai_gen.generate_response(
+        query="Test", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+    )
+
+    assert ai_gen.client.invoke_model.call_count == expected_api_calls
+    assert result == expected_result
+
+
+def test_latency_mode_passed_to_invoke_model(ai_gen):
+    """Test optimized latency mode is forwarded to Bedrock, standard mode is omitted"""
+    ai_gen.client.invoke_model.return_value = get_mock_direct_bedrock()
+
+    ai_gen.generate_response(query="Test")
+    assert "performanceConfigLatency" not in ai_gen.client.invoke_model.call_args.kwargs
+
+    optimized_gen = AIGenerator(
+        aws_access_key_id="test_key",
+        aws_secret_access_key="test_secret",
+        aws_session_token="test_token",
+        aws_region="us-east-1",
+        model_id="test-model",
+        latency_mode="optimized",
+        client=Mock(),
+    )
+    optimized_gen.client.invoke_model.return_value = get_mock_direct_bedrock()
+
+    optimized_gen.generate_response(query="Test")
+    call_kwargs = optimized_gen.client.invoke_model.call_args.kwargs
+    assert call_kwargs["modelId"] == "test-model"
+    assert call_kwargs["contentType"] == "application/json"
+    assert call_kwargs["accept"] == "application/json"
+    assert call_kwargs["performanceConfigLatency"] == "optimized"
+
+
+def test_bedrock_client_created_on_first_use():
+    """Test constructing AIGenerator does not create a boto3 client until it is needed"""
+    _get_bedrock_client.cache_clear()
+    with patch("boto3.client") as mock_boto_client:
+        ai_gen = AIGenerator(
+            aws_access_key_id="test_key",
+            aws_secret_access_key="test_secret",
+            aws_session_token="test_token",
+            aws_region="us-east-1",
+            model_id="test-model",
         )
+        mock_boto_client.assert_not_called()
 
-        # Verify single round: 2 API calls, 1 tool execution
-        assert ai_gen.client.invoke_model.call_count == 2
-        assert mock_tool_manager.execute_tool.call_count == 1
-        assert "Supervised learning" in result
-
-    def test_two_round_sequential_calling(self):
-        """Test Claude can make 2 sequential tool calls"""
-        ai_gen = self.create_mock_ai_generator()
+        assert ai_gen.client is mock_boto_client.return_value
+        assert ai_gen.client is mock_boto_client.return_value
+        mock_boto_client.assert_called_once()
+    _get_bedrock_client.cache_clear()
 
-        # Mock 3 responses: tool_use → tool_use → final
-        round1_response = get_mock_tool_use_response()
-        round2_response = get_mock_tool_use_response_round2()
-        final_response = get_mock_final_response()
 
-        ai_gen.client.invoke_model.side_effect = [
-            get_mock_bedrock_response_bytes(round1_response),
-            get_mock_bedrock_response_bytes(round2_response),
-            get_mock_bedrock_response_bytes(final_response),
-        ]
+def test_stream_yields_text_chunks(ai_gen):
+    """Test streaming a direct response without tools yields text deltas as they arrive"""
+    ai_gen.client.invoke_model_with_response_stream.return_value = get_mock_bedrock_stream_response(
+        get_mock_direct_response()
+    )
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.side_effect = [
-            "ML result about supervised learning",
-            "DL result about neural networks",
-        ]
+    chunks = list(ai_gen.generate_response_stream(query="What is 2+2?"))
 
-        tools = [{"name": "search_course_content"}]
-
-        result = ai_gen.generate_response(
-            query="Compare ML and DL approaches", tools=tools, tool_manager=mock_tool_manager
-        )
+    assert len(chunks) == 2
+    assert "".join(chunks) == get_mock_direct_response()["content"][0]["text"]
+    ai_gen.client.invoke_model.assert_not_called()
 
-        # Verify 2 rounds: 3 API calls, 2 tool executions
-        assert ai_gen.client.invoke_model.call_count == 3
-        assert mock_tool_manager.execute_tool.call_count == 2
-        assert result is not None
 
-    def test_early_termination_after_round_1(self):
-        """Test Claude can terminate after round 1 if satisfied"""
-        ai_gen = self.create_mock_ai_generator()
+def streamed_deltas(response):
+    """The text deltas get_mock_bedrock_stream_response splits a response's text block into"""
+    text = response["content"][0]["text"]
+    middle = len(text) // 2
+    return [text[:middle], text[middle:]]
 
-        # Mock 2 responses: tool_use → final (no more tool_use)
-        round1_response = get_mock_tool_use_response()
-        final_response = get_mock_final_response()
 
-        ai_gen.client.invoke_model.side_effect = [
-            get_mock_bedrock_response_bytes(round1_response),
-            get_mock_bedrock_response_bytes(final_response),
-        ]
+def test_stream_tool_use_runs_tool_rounds(ai_gen, mock_tool_manager):
+    """Test streaming withdraws the tool preamble, then streams the follow-up answer"""
+    ai_gen.client.invoke_model_with_response_stream.side_effect = [
+        get_mock_bedrock_stream_response(get_mock_tool_use_response()),
+        get_mock_bedrock_stream_response(get_mock_final_response()),
+    ]
+    mock_tool_manager.execute_tool.return_value = "ML search results"
 
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.return_value = "Sufficient results"
-
-        tools = [{"name": "search_course_content"}]
-
-        result = ai_gen.generate_response(
-            query="Simple question", tools=tools, tool_manager=mock_tool_manager
+    chunks = list(
+        ai_gen.generate_response_stream(
+            query="What is supervised learning?",
+            tools=SEARCH_TOOLS,
+            tool_manager=mock_tool_manager,
         )
-
-        # Verify early termination: only 2 API calls, 1 tool execution
-        assert ai_gen.client.invoke_model.call_count == 2
-        assert mock_tool_manager.execute_tool.call_count == 1
-        assert "Supervised learning" in result
-
-    def test_max_rounds_enforced(self):
-        """Test that tool calls are ignored after 2 rounds"""
-        ai_gen = self.create_mock_ai_generator()
-
-        # Mock 3 responses all with tool_use (Claude doesn't stop)
-        round1_response = get_mock_tool_use_response()
-        round2_response = get_mock_tool_use_response_round2()
-        round3_response = get_mock_tool_use_response_round3()  # Would be 3rd round
-
-        ai_gen.client.invoke_model.side_effect = [
-            get_mock_bedrock_response_bytes(round1_response),
-            get_mock_bedrock_response_bytes(round2_response),
-            get_mock_bedrock_response_bytes(round3_response),
-        ]
-
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
-
-        tools = [{"name": "search_course_content"}]
-
-        result = ai_gen.generate_response(
-            query="Complex question", tools=tools, tool_manager=mock_tool_manager
+    )
+
+    # Tool input is reassembled from the partial JSON deltas
+    mock_tool_manager.execute_tool.assert_called_once_with(
+        "search_course_content", query="supervised learning", course_name="Machine Learning"
+    )
+    ai_gen.client.invoke_model.assert_not_called()
+
+    # The preamble streams, is withdrawn once the tool call starts, then the answer streams
+    assert chunks == [
+        *streamed_deltas(get_mock_tool_use_response()),
+        DISCARD_TEXT,
+        *streamed_deltas(get_mock_final_response()),
+    ]
+
+    # The text left after the discard is what generate_response returns
+    ai_gen.client.invoke_model.side_effect = [get_mock_tool_use_bedrock(), get_mock_final_bedrock()]
+    result = ai_gen.generate_response(
+        query="What is supervised learning?", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+    )
+    assert "".join(chunks[chunks.index(DISCARD_TEXT) + 1 :]) == result
+
+
+def test_stream_two_tool_rounds(ai_gen, mock_tool_manager):
+    """Test each round's preamble is withdrawn and the last round is sent without tools"""
+    responses = [
+        get_mock_tool_use_response(),
+        get_mock_tool_use_response_round2(),
+        get_mock_final_response(),
+    ]
+    ai_gen.client.invoke_model_with_response_stream.side_effect = [
+        get_mock_bedrock_stream_response(response) for response in responses
+    ]
+    mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
+
+    chunks = list(
+        ai_gen.generate_response_stream(
+            query="Compare courses", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
         )
+    )
+
+    assert chunks == [
+        *streamed_deltas(responses[0]),
+        DISCARD_TEXT,
+        *streamed_deltas(responses[1]),
+        DISCARD_TEXT,
+        *streamed_deltas(responses[2]),
+    ]
+    calls = ai_gen.client.invoke_model_with_response_stream.call_args_list
+    assert ["tools" in orjson.loads(call.kwargs["body"]) for call in calls] == [True, True, False]
+
+
+def test_stream_with_tools_streams_direct_answer(ai_gen, mock_tool_manager):
+    """Test a direct answer streams as deltas when tools are offered and matches the sync path"""
+    ai_gen.client.invoke_model_with_response_stream.return_value = get_mock_bedrock_stream_response(
+        get_mock_direct_response()
+    )
+
+    chunks = list(
+        ai_gen.generate_response_stream(
+            query="What is 2+2?", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+        )
+    )
 
-        # Verify hard limit: 3 API calls, but only 2 tool executions
-        assert ai_gen.client.invoke_model.call_count == 3
-        assert mock_tool_manager.execute_tool.call_count == 2
-        # Should extract text from round3_response despite tool_use
-        assert result is not None
-        assert "would like to search again" in result.lower()
-
-    def test_context_preserved_across_rounds(self):
-        """Test that message history is preserved across rounds"""
-        ai_gen = self.create_mock_ai_generator()
-
-        round1_response = get_mock_tool_use_response()
-        round2_response = get_mock_tool_use_response_round2()
-        final_response = get_mock_final_response()
-
-        captured_requests = []
-
-        def capture_invoke(modelId, body):
-            captured_requests.append(json.loads(body))
-            idx = len(captured_requests) - 1
-            if idx == 0:
-                return get_mock_bedrock_response_bytes(round1_response)
-            elif idx == 1:
-                return get_mock_bedrock_response_bytes(round2_response)
-            return get_mock_bedrock_response_bytes(final_response)
-
-        ai_gen.client.invoke_model.side_effect = capture_invoke
-
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
-
-        tools = [{"name": "search_course_content"}]
-
-        ai_gen.generate_response(query="Test", tools=tools, tool_manager=mock_tool_manager)
-
-        # Verify message accumulation
-        assert len(captured_requests) == 3
-
-        # Initial call: 1 message (user query)
-        assert len(captured_requests[0]["messages"]) == 1
-        assert captured_requests[0]["messages"][0]["role"] == "user"
-
-        # After round 1: 3 messages (user + assistant + tool_results)
-        assert len(captured_requests[1]["messages"]) == 3
-        assert captured_requests[1]["messages"][0]["role"] == "user"
-        assert captured_requests[1]["messages"][1]["role"] == "assistant"
-        assert captured_requests[1]["messages"][2]["role"] == "user"
-
-        # After round 2: 5 messages
-        assert len(captured_requests[2]["messages"]) == 5
-        assert captured_requests[2]["messages"][3]["role"] == "assistant"
-        assert captured_requests[2]["messages"][4]["role"] == "user"
-
-    def test_tools_included_in_both_rounds(self):
-        """Test tools are included in calls for rounds 1 and 2, but not final call"""
-        ai_gen = self.create_mock_ai_generator()
-
-        round1_response = get_mock_tool_use_response()
-        round2_response = get_mock_tool_use_response_round2()
-        round3_response = get_mock_tool_use_response_round3()
-
-        captured_requests = []
-
-        def capture_invoke(modelId, body):
-            captured_requests.append(json.loads(body))
-            idx = len(captured_requests) - 1
-            if idx == 0:
-                return get_mock_bedrock_response_bytes(round1_response)
-            elif idx == 1:
-                return get_mock_bedrock_response_bytes(round2_response)
-            return get_mock_bedrock_response_bytes(round3_response)
-
-        ai_gen.client.invoke_model.side_effect = capture_invoke
-
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.side_effect = ["Result 1", "Result 2"]
-
-        tools = [{"name": "search_course_content"}]
-
-        ai_gen.generate_response(query="Test", tools=tools, tool_manager=mock_tool_manager)
-
-        # Call 1 (initial): has tools
-        assert "tools" in captured_requests[0]
-        assert captured_requests[0]["tools"] == tools
-
-        # Call 2 (after round 1): has tools
-        assert "tools" in captured_requests[1]
-        assert captured_requests[1]["tools"] == tools
-
-        # Call 3 (after round 2, final): NO tools
-        assert "tools" not in captured_requests[2]
-
-    def test_tool_execution_error_handling(self):
-        """Test graceful handling when tool execution fails"""
-        ai_gen = self.create_mock_ai_generator()
-
-        tool_use_response = get_mock_tool_use_response()
-        final_response = get_mock_final_response()
-
-        ai_gen.client.invoke_model.side_effect = [
-            get_mock_bedrock_response_bytes(tool_use_response),
-            get_mock_bedrock_response_bytes(final_response),
-        ]
-
-        mock_tool_manager = Mock()
-        mock_tool_manager.execute_tool.side_effect = Exception("Tool execution failed")
-
-        tools = [{"name": "search_course_content"}]
-
-        # Should not raise exception
-        result = ai_gen.generate_response(query="Test", tools=tools, tool_manager=mock_tool_manager)
+    assert chunks == streamed_deltas(get_mock_direct_response())
+    mock_tool_manager.execute_tool.assert_not_called()
 
-        # Should get final response despite tool error
-        assert result is not None
-        assert ai_gen.client.invoke_model.call_count == 2
+    ai_gen.response_cache.clear()
+    ai_gen.client.invoke_model.return_value = get_mock_direct_bedrock()
+    result = ai_gen.generate_response(
+        query="What is 2+2?", tools=SEARCH_TOOLS, tool_manager=mock_tool_manager
+    )
+    assert "".join(chunks) == result
 
 
 if __name__ == "__main__":
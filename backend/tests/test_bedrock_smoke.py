@@ -0,0 +1,44 @@
+"""
+Smoke test against the real Bedrock API
+
+Sends one simple query through AIGenerator to verify credentials, region and model access.
+Skipped unless AWS credentials are configured, and marked network/slow so the default
+pytest run deselects it.
+"""
+
+import os
+
+import pytest
+from ai_generator import AIGenerator
+from config import config
+
+# Mark all tests in this module as needing network access to Bedrock
+pytestmark = [
+    pytest.mark.network,
+    pytest.mark.bedrock,
+    pytest.mark.slow,
+    pytest.mark.skipif(not os.getenv("AWS_ACCESS_KEY_ID"), reason="no AWS credentials"),
+]
+
+
+def test_bedrock_roundtrip():
+    """Test a simple query round-trips through Bedrock and returns text"""
+    # Checked here rather than at import, so collecting this module never loads boto3
+    pytest.importorskip("boto3")
+
+    ai_gen = AIGenerator(
+        config.AWS_ACCESS_KEY_ID,
+        config.AWS_SECRET_ACCESS_KEY,
+        config.AWS_SESSION_TOKEN,
+        config.AWS_REGION,
+        config.BEDROCK_MODEL_ID,
+    )
+
+    response = ai_gen.generate_response("What is 2+2?")
+
+    assert isinstance(response, str)
+    assert response.strip()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
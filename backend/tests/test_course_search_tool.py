@@ -8,26 +8,47 @@ These tests verify that the CourseSearchTool correctly:
 4. Handles edge cases (empty results, errors, filters)
 """
 
-import os
-import sys
-from unittest.mock import MagicMock, Mock
+from typing import Any, Dict, List, Optional
 
 import pytest
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from search_tools import CourseSearchTool
 from vector_store import SearchResults
 
 
+class StubStore:
+    """Minimal VectorStore stand-in returning canned results and recording searches"""
+
+    def __init__(self, results: Optional[SearchResults] = None, lesson_link: Optional[str] = None):
+        self.results = results
+        self.lesson_link = lesson_link
+        self.search_calls: List[Dict[str, Any]] = []
+
+    def search(self, **kwargs) -> Optional[SearchResults]:
+        self.search_calls.append(kwargs)
+        return self.results
+
+    def get_lesson_link(self, course_title: str, lesson_number: int) -> Optional[str]:
+        return self.lesson_link
+
+
+@pytest.fixture
+def stub_store():
+    """Stub vector store; tests set .results and .lesson_link before executing"""
+    return StubStore()
+
+
+@pytest.fixture
+def tool(stub_store):
+    """CourseSearchTool backed by the stub vector store"""
+    return CourseSearchTool(stub_store)
+
+
 class TestCourseSearchToolExecute:
     """Test CourseSearchTool.execute() with various scenarios"""
 
-    def test_execute_with_valid_results(self):
+    def test_execute_with_valid_results(self, stub_store, tool):
         """Test execute returns formatted results when search succeeds"""
-        # Setup mock vector store
-        mock_store = Mock()
+        # Setup stub vector store
         mock_results = SearchResults(
             documents=[
                 "Machine learning is a subset of AI that enables systems to learn.",
@@ -40,17 +61,16 @@ class TestCourseSearchToolExecute:
             distances=[0.1, 0.2],
             error=None,
         )
-        mock_store.search.return_value = mock_results
-        mock_store.get_lesson_link.return_value = "https://example.com/ml-course/lesson-0"
+        stub_store.results = mock_results
+        stub_store.lesson_link = "https://example.com/ml-course/lesson-0"
 
-        # Create tool and execute
-        tool = CourseSearchTool(mock_store)
+        # Execute the tool
         result = tool.execute(query="machine learning", course_name="ML")
 
         # Verify search was called correctly
-        mock_store.search.assert_called_once_with(
-            query="machine learning", course_name="ML", lesson_number=None
-        )
+        assert stub_store.search_calls == [
+            {"query": "machine learning", "course_name": "ML", "lesson_number": None}
+        ]
 
         # Verify result format
         assert "[Introduction to Machine Learning - Lesson 0]" in result
@@ -58,19 +78,17 @@ class TestCourseSearchToolExecute:
         assert "Machine learning is a subset of AI" in result
         assert "Supervised learning uses labeled training data" in result
 
-    def test_execute_tracks_sources(self):
+    def test_execute_tracks_sources(self, stub_store, tool):
         """Test execute tracks sources with links for UI"""
-        mock_store = Mock()
         mock_results = SearchResults(
             documents=["Test content"],
             metadata=[{"course_title": "Test Course", "lesson_number": 1}],
             distances=[0.1],
             error=None,
         )
-        mock_store.search.return_value = mock_results
-        mock_store.get_lesson_link.return_value = "https://example.com/test/lesson-1"
+        stub_store.results = mock_results
+        stub_store.lesson_link = "https://example.com/test/lesson-1"
 
-        tool = CourseSearchTool(mock_store)
         result = tool.execute(query="test")
 
         # Verify sources were tracked
@@ -78,93 +96,63 @@ class TestCourseSearchToolExecute:
         assert tool.last_sources[0]["text"] == "Test Course - Lesson 1"
         assert tool.last_sources[0]["link"] == "https://example.com/test/lesson-1"
 
-    def test_execute_with_empty_results(self):
-        """Test execute returns appropriate message when no results found"""
-        mock_store = Mock()
-        mock_results = SearchResults(documents=[], metadata=[], distances=[], error=None)
-        mock_store.search.return_value = mock_results
-
-        tool = CourseSearchTool(mock_store)
-        result = tool.execute(query="nonexistent topic")
-
-        assert "No relevant content found" in result
-
-    def test_execute_with_course_filter(self):
-        """Test execute includes course name in 'not found' message"""
-        mock_store = Mock()
-        mock_results = SearchResults(documents=[], metadata=[], distances=[], error=None)
-        mock_store.search.return_value = mock_results
-
-        tool = CourseSearchTool(mock_store)
-        result = tool.execute(query="test", course_name="Nonexistent Course")
-
-        assert "No relevant content found in course 'Nonexistent Course'" in result
-
-    def test_execute_with_lesson_filter(self):
-        """Test execute includes lesson number in 'not found' message"""
-        mock_store = Mock()
-        mock_results = SearchResults(documents=[], metadata=[], distances=[], error=None)
-        mock_store.search.return_value = mock_results
-
-        tool = CourseSearchTool(mock_store)
-        result = tool.execute(query="test", lesson_number=5)
-
-        assert "No relevant content found in lesson 5" in result
-
-    def test_execute_with_search_error(self):
-        """Test execute returns error message when search fails"""
-        mock_store = Mock()
-        mock_results = SearchResults(
-            documents=[], metadata=[], distances=[], error="Database connection failed"
-        )
-        mock_store.search.return_value = mock_results
-
-        tool = CourseSearchTool(mock_store)
-        result = tool.execute(query="test")
-
-        assert "Database connection failed" in result
-
-    def test_execute_without_lesson_numbers(self):
+    @pytest.mark.parametrize(
+        "kwargs,error,expected",
+        [
+            ({"query": "nonexistent topic"}, None, "No relevant content found"),
+            (
+                {"query": "test", "course_name": "Nonexistent Course"},
+                None,
+                "No relevant content found in course 'Nonexistent Course'",
+            ),
+            ({"query": "test", "lesson_number": 5}, None, "No relevant content found in lesson 5"),
+            ({"query": "test"}, "Database connection failed", "Database connection failed"),
+        ],
+        ids=["empty_results", "course_filter", "lesson_filter", "search_error"],
+    )
+    def test_execute_without_results(self, stub_store, tool, kwargs, error, expected):
+        """Test execute reports empty results (naming any filters) or the search error"""
+        stub_store.results = SearchResults(documents=[], metadata=[], distances=[], error=error)
+
+        result = tool.execute(**kwargs)
+
+        assert expected in result
+
+    def test_execute_without_lesson_numbers(self, stub_store, tool):
         """Test execute handles results without lesson numbers"""
-        mock_store = Mock()
         mock_results = SearchResults(
             documents=["General course information"],
             metadata=[{"course_title": "Test Course", "lesson_number": None}],
             distances=[0.1],
             error=None,
         )
-        mock_store.search.return_value = mock_results
+        stub_store.results = mock_results
 
-        tool = CourseSearchTool(mock_store)
         result = tool.execute(query="test")
 
         # Should only show course title, not lesson number
         assert "[Test Course]" in result
         assert "Lesson" not in result or "General course information" in result
 
-    def test_execute_with_lesson_link_none(self):
+    def test_execute_with_lesson_link_none(self, stub_store, tool):
         """Test execute handles missing lesson links gracefully"""
-        mock_store = Mock()
         mock_results = SearchResults(
             documents=["Test content"],
             metadata=[{"course_title": "Test Course", "lesson_number": 1}],
             distances=[0.1],
             error=None,
         )
-        mock_store.search.return_value = mock_results
-        mock_store.get_lesson_link.return_value = None
+        stub_store.results = mock_results
+        stub_store.lesson_link = None
 
-        tool = CourseSearchTool(mock_store)
         result = tool.execute(query="test")
 
         # Verify source tracked with None link
         assert len(tool.last_sources) == 1
         assert tool.last_sources[0]["link"] is None
 
-    def test_get_tool_definition(self):
+    def test_get_tool_definition(self, tool):
         """Test tool definition is correctly formatted for Anthropic API"""
-        mock_store = Mock()
-        tool = CourseSearchTool(mock_store)
         definition = tool.get_tool_definition()
 
         assert definition["name"] == "search_course_content"
@@ -8,65 +8,46 @@ These tests verify the complete flow:
 4. Test with mock AI responses to isolate vector store issues
 """
 
-import os
-import shutil
-import sys
-import tempfile
-from unittest.mock import Mock, patch
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
 
 import pytest
-
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from config import Config
-from document_processor import DocumentProcessor
+import rag_system as rag_system_module
+from ai_generator import DISCARD_TEXT, AIGenerator
 from rag_system import RAGSystem
 from tests.fixtures.mock_responses import (
     get_mock_bedrock_response_bytes,
+    get_mock_bedrock_stream_response,
     get_mock_final_response,
     get_mock_tool_use_response,
 )
-from vector_store import VectorStore
-
-
-class TestRAGSystemIntegration:
-    """Integration tests with real vector store and mock AI"""
-
-    @pytest.fixture
-    def temp_db_path(self):
-        """Create temporary database directory"""
-        temp_dir = tempfile.mkdtemp()
-        yield temp_dir
-        shutil.rmtree(temp_dir)
-
-    @pytest.fixture
-    def test_config(self, temp_db_path):
-        """Create test configuration with temporary database"""
-        config = Config()
-        config.CHROMA_PATH = temp_db_path
-        return config
-
-    @pytest.fixture
-    def vector_store_with_data(self, test_config):
-        """Create vector store and load sample course"""
-        # Initialize components
-        processor = DocumentProcessor(test_config.CHUNK_SIZE, test_config.CHUNK_OVERLAP)
-        store = VectorStore(
-            test_config.CHROMA_PATH, test_config.EMBEDDING_MODEL, test_config.MAX_RESULTS
-        )
-
-        # Load sample course
-        sample_course_path = os.path.join(
-            os.path.dirname(__file__), "fixtures", "sample_course.txt"
-        )
 
-        course, chunks = processor.process_course_document(sample_course_path)
-        store.add_course_metadata(course)
-        store.add_course_content(chunks)
+# Mark all tests in this module as integration tests (they load ChromaDB and the embedding model)
+pytestmark = pytest.mark.integration
 
-        return store
 
+class TestRAGSystemIntegration:
+    """
+    Integration tests with real vector store and mock AI
+
+    vector_store_with_data and test_config come from conftest.py and are
+    session-scoped, so the sample course is embedded once for every test here.
+    Tests that only check tool formatting, routing or source tracking run against
+    both the in-memory fake and the real store. Everything that touches ChromaDB or
+    the embedding model is marked slow and skipped by default (run with -m "").
+    """
+
+    @pytest.fixture(
+        params=["fake_store", pytest.param("vector_store_with_data", marks=pytest.mark.slow)],
+        ids=["fake", "real"],
+    )
+    def loaded_store(self, request):
+        """Sample course store: the in-memory fake, or the real ChromaDB store (slow)"""
+        return request.getfixturevalue(request.param)
+
+    @pytest.mark.slow
     def test_vector_store_has_data(self, vector_store_with_data):
         """Test that sample course was loaded correctly"""
         store = vector_store_with_data
@@ -84,6 +65,7 @@ class TestRAGSystemIntegration:
         assert results.error is None
         assert len(results.documents) > 0
 
+    @pytest.mark.slow
     def test_vector_store_search_returns_relevant_content(self, vector_store_with_data):
         """Test that search returns content related to query"""
         store = vector_store_with_data
@@ -97,6 +79,7 @@ class TestRAGSystemIntegration:
         )
         assert found_neural_network_content, "Expected to find neural network content"
 
+    @pytest.mark.slow
     def test_vector_store_course_filter(self, vector_store_with_data):
         """Test search with course name filter"""
         store = vector_store_with_data
@@ -109,11 +92,11 @@ class TestRAGSystemIntegration:
         results = store.search("machine learning", course_name="Nonexistent Course")
         assert results.error is not None or results.is_empty()
 
-    def test_course_search_tool_with_real_store(self, vector_store_with_data):
-        """Test CourseSearchTool with real vector store data"""
+    def test_course_search_tool_with_loaded_store(self, loaded_store):
+        """Test CourseSearchTool with sample course store data"""
         from search_tools import CourseSearchTool
 
-        tool = CourseSearchTool(vector_store_with_data)
+        tool = CourseSearchTool(loaded_store)
 
         # Execute search
         result = tool.execute(query="supervised learning")
@@ -128,68 +111,189 @@ class TestRAGSystemIntegration:
         assert "text" in source
         assert "link" in source
 
+    @pytest.mark.slow
     def test_rag_system_query_with_mock_ai(self, test_config, vector_store_with_data):
         """Test full RAG system query with mocked AI responses"""
-        # Create RAG system with mocked AI
-        with patch("rag_system.AIGenerator") as MockAIGen:
-            # Setup mock AI generator
-            mock_ai_instance = Mock()
-
-            # Simulate tool calling flow
-            def mock_generate(query, conversation_history, tools, tool_manager):
-                # Simulate AI deciding to use tool
-                if tools and tool_manager:
-                    # Execute the search tool
-                    result = tool_manager.execute_tool(
-                        "search_course_content",
-                        query="supervised learning",
-                        course_name="Machine Learning",
-                    )
-                    return f"Based on the search results: {result[:100]}..."
-                return "Direct answer"
-
-            mock_ai_instance.generate_response.side_effect = mock_generate
-            MockAIGen.return_value = mock_ai_instance
-
-            # Create RAG system
-            rag = RAGSystem(test_config)
-            rag.vector_store = vector_store_with_data
-
-            # Execute query
-            answer, sources = rag.query("What is supervised learning?")
-
-            # Verify response
-            assert answer is not None
-            assert len(answer) > 0
-            assert "Based on the search results" in answer
-
-            # Verify sources were tracked
-            assert isinstance(sources, list)
-            # Sources might be empty if tool returns formatted text without tracking
-            # But the important thing is the query didn't crash
-
-    def test_rag_system_empty_database(self, test_config, temp_db_path):
-        """Test RAG system behavior with empty database"""
-        # Create RAG system with empty database
-        config = test_config
-        config.CHROMA_PATH = temp_db_path
+        # Setup mock AI generator; spec checks calls against the real AIGenerator API
+        mock_ai = Mock(spec=AIGenerator)
+
+        # Simulate tool calling flow
+        def mock_generate(query, conversation_history, tools, tool_manager):
+            # Simulate AI deciding to use tool
+            if tools and tool_manager:
+                # Execute the search tool
+                result = tool_manager.execute_tool(
+                    "search_course_content",
+                    query="supervised learning",
+                    course_name="Machine Learning",
+                )
+                return f"Based on the search results: {result[:100]}..."
+            return "Direct answer"
+
+        mock_ai.generate_response.side_effect = mock_generate
+
+        # Create RAG system with the mocked AI injected
+        rag = RAGSystem(test_config, ai_generator=mock_ai)
+        rag.vector_store = vector_store_with_data
+
+        # Execute query
+        answer, sources = rag.query("What is supervised learning?")
+
+        # Verify response
+        assert answer is not None
+        assert len(answer) > 0
+        assert "Based on the search results" in answer
+
+        # Verify sources were tracked
+        assert isinstance(sources, list)
+        # Sources might be empty if tool returns formatted text without tracking
+        # But the important thing is the query didn't crash
+
+    def test_concurrent_queries_keep_their_own_sources(self, test_config, fake_store, monkeypatch):
+        """Test parallel queries on one RAG system each return the sources of their own search"""
+        # Build the RAG system around the in-memory store instead of ChromaDB
+        monkeypatch.setattr(rag_system_module, "VectorStore", lambda *args: fake_store)
+
+        # Both queries search before either collects its sources, so any source state
+        # shared between them would hand one query the other's results
+        both_searched = threading.Barrier(2, timeout=5)
+
+        def mock_generate(query, conversation_history, tools, tool_manager):
+            lesson_number = 1 if "supervised" in query else 2
+            tool_manager.execute_tool(
+                "search_course_content", query=query, lesson_number=lesson_number
+            )
+            both_searched.wait()
+            return f"Answer from lesson {lesson_number}"
+
+        mock_ai = Mock(spec=AIGenerator)
+        mock_ai.generate_response.side_effect = mock_generate
+        rag = RAGSystem(test_config, ai_generator=mock_ai)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            supervised = pool.submit(rag.query, "What is supervised learning?")
+            neural = pool.submit(rag.query, "How do neural networks work?")
+            results = {1: supervised.result(), 2: neural.result()}
+
+        for lesson_number, (answer, sources) in results.items():
+            assert answer == f"Answer from lesson {lesson_number}"
+            assert sources
+            assert all(s["text"].endswith(f"Lesson {lesson_number}") for s in sources)
+
+    def test_query_stream_yields_text_and_returns_sources(
+        self, test_config, fake_store, monkeypatch
+    ):
+        """Test query_stream yields the answer, returns its sources and records the exchange"""
+        monkeypatch.setattr(rag_system_module, "VectorStore", lambda *args: fake_store)
+
+        def mock_generate_stream(query, conversation_history, tools, tool_manager):
+            tool_manager.execute_tool(
+                "search_course_content", query="supervised learning", lesson_number=1
+            )
+            yield "Supervised learning "
+            yield "uses labeled data."
+
+        mock_ai = Mock(spec=AIGenerator)
+        mock_ai.generate_response_stream.side_effect = mock_generate_stream
+        rag = RAGSystem(test_config, ai_generator=mock_ai)
+        session_id = rag.session_manager.create_session()
+
+        stream = rag.query_stream("What is supervised learning?", session_id)
+        chunks = []
+        with pytest.raises(StopIteration) as done:
+            while True:
+                chunks.append(next(stream))
+
+        assert chunks == ["Supervised learning ", "uses labeled data."]
+        sources = done.value.value
+        assert sources
+        assert all(s["text"].endswith("Lesson 1") for s in sources)
+
+        # The joined answer is saved to history, as query() would save it
+        history = rag.session_manager.get_conversation_history(session_id)
+        assert history.endswith("Assistant: Supervised learning uses labeled data.")
+
+    def test_query_stream_with_real_tools_streams_incrementally(
+        self, test_config, fake_store, monkeypatch
+    ):
+        """Test query_stream through a real AIGenerator streams the post-tool answer in chunks"""
+        monkeypatch.setattr(rag_system_module, "VectorStore", lambda *args: fake_store)
+
+        # Only the Bedrock client is stubbed: Claude searches, then answers
+        client = Mock()
+        client.invoke_model_with_response_stream.side_effect = [
+            get_mock_bedrock_stream_response(get_mock_tool_use_response()),
+            get_mock_bedrock_stream_response(get_mock_final_response()),
+        ]
+        ai_gen = AIGenerator("key", "secret", None, "us-east-1", "test-model", client=client)
+        rag = RAGSystem(test_config, ai_generator=ai_gen)
+        session_id = rag.session_manager.create_session()
+
+        stream = rag.query_stream("What is supervised learning?", session_id)
+        chunks = []
+        with pytest.raises(StopIteration) as done:
+            while True:
+                chunks.append(next(stream))
+
+        # The real tool definitions were offered to Claude
+        first_call = client.invoke_model_with_response_stream.call_args_list[0]
+        first_body = json.loads(first_call.kwargs["body"])
+        assert [tool["name"] for tool in first_body["tools"]] == [
+            "search_course_content",
+            "get_course_outline",
+        ]
+
+        # The answer reaches the caller in several chunks after the preamble is withdrawn
+        final_text = get_mock_final_response()["content"][0]["text"]
+        answer_chunks = chunks[chunks.index(DISCARD_TEXT) + 1 :]
+        assert len(answer_chunks) > 1
+        assert "".join(answer_chunks) == final_text
+
+        assert done.value.value
+        history = rag.session_manager.get_conversation_history(session_id)
+        assert history.endswith(f"Assistant: {final_text}")
+
+    def test_parallel_tool_calls_keep_all_sources(self, loaded_store):
+        """Test two searches from one response run in parallel and both record sources"""
+        from search_tools import CourseSearchTool, ToolManager
 
+        manager = ToolManager()
+        manager.register_tool(CourseSearchTool(loaded_store))
+        tool_session = manager.start_query()
+
+        tool_blocks = [
+            {
+                "type": "tool_use",
+                "id": f"tool_{lesson_number}",
+                "name": "search_course_content",
+                "input": {"query": query, "lesson_number": lesson_number},
+            }
+            for lesson_number, query in [(1, "supervised learning"), (2, "neural networks")]
+        ]
+        ai_gen = AIGenerator("key", "secret", None, "us-east-1", "test-model")
+        tool_results = ai_gen._execute_tools(tool_blocks, tool_session)
+
+        assert [r["tool_use_id"] for r in tool_results] == ["tool_1", "tool_2"]
+        source_texts = {s["text"] for s in tool_session.sources}
+        assert any(text.endswith("Lesson 1") for text in source_texts)
+        assert any(text.endswith("Lesson 2") for text in source_texts)
+
+    @pytest.mark.slow
+    def test_rag_system_empty_database(self, empty_vector_store):
+        """Test RAG system behavior with empty database"""
         from search_tools import CourseSearchTool
 
-        # Create empty vector store
-        store = VectorStore(config.CHROMA_PATH, config.EMBEDDING_MODEL, config.MAX_RESULTS)
-
-        # Test search returns empty
-        tool = CourseSearchTool(store)
+        # Test search against an empty vector store returns empty
+        tool = CourseSearchTool(empty_vector_store)
         result = tool.execute(query="anything")
 
         assert "No relevant content found" in result
 
-    def test_course_outline_tool_with_real_store(self, vector_store_with_data):
-        """Test CourseOutlineTool with real vector store data"""
+    def test_course_outline_tool_with_loaded_store(self, loaded_store):
+        """Test CourseOutlineTool with sample course store data"""
         from search_tools import CourseOutlineTool
 
-        tool = CourseOutlineTool(vector_store_with_data)
+        tool = CourseOutlineTool(loaded_store)
 
         # Execute outline retrieval
         result = tool.execute(course_title="Machine Learning")
@@ -200,13 +304,13 @@ class TestRAGSystemIntegration:
         assert "Lesson 1:" in result
         assert "Lesson 2:" in result
 
-    def test_tool_manager_routing(self, vector_store_with_data):
+    def test_tool_manager_routing(self, loaded_store):
         """Test ToolManager correctly routes to different tools"""
         from search_tools import CourseOutlineTool, CourseSearchTool, ToolManager
 
         manager = ToolManager()
-        search_tool = CourseSearchTool(vector_store_with_data)
-        outline_tool = CourseOutlineTool(vector_store_with_data)
+        search_tool = CourseSearchTool(loaded_store)
+        outline_tool = CourseOutlineTool(loaded_store)
 
         manager.register_tool(search_tool)
         manager.register_tool(outline_tool)
@@ -223,12 +327,12 @@ class TestRAGSystemIntegration:
         result = manager.execute_tool("nonexistent_tool")
         assert "not found" in result.lower()
 
-    def test_source_tracking_and_reset(self, vector_store_with_data):
+    def test_source_tracking_and_reset(self, loaded_store):
         """Test that sources are tracked and reset correctly"""
         from search_tools import CourseSearchTool, ToolManager
 
         manager = ToolManager()
-        tool = CourseSearchTool(vector_store_with_data)
+        tool = CourseSearchTool(loaded_store)
         manager.register_tool(tool)
 
         # Execute search
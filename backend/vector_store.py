@@ -1,4 +1,6 @@
+import json
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 import chromadb
@@ -7,6 +9,14 @@ from models import Course, CourseChunk
 from sentence_transformers import SentenceTransformer
 
 
+@lru_cache(maxsize=None)
+def _get_embedding_function(model_name: str):
+    """Return a shared embedding function so each model is loaded once per process"""
+    return chromadb.utils.embedding_functions.SentenceTransformerEmbeddingFunction(
+        model_name=model_name
+    )
+
+
 @dataclass
 class SearchResults:
     """Container for search results with metadata"""
@@ -45,12 +55,8 @@ class VectorStore:
             path=chroma_path, settings=Settings(anonymized_telemetry=False)
         )
 
-        # Set up sentence transformer embedding function
-        self.embedding_function = (
-            chromadb.utils.embedding_functions.SentenceTransformerEmbeddingFunction(
-                model_name=embedding_model
-            )
-        )
+        # Set up sentence transformer embedding function, reused across stores
+        self.embedding_function = _get_embedding_function(embedding_model)
 
         # Create collections for different types of data
         self.course_catalog = self._create_collection("course_catalog")  # Course titles/instructors
@@ -139,8 +145,6 @@ class VectorStore:
 
     def add_course_metadata(self, course: Course):
         """Add course information to the catalog for semantic search"""
-        import json
-
         course_text = course.title
 
         # Build lessons metadata and serialize as JSON string
@@ -223,8 +227,6 @@ class VectorStore:
 
     def get_all_courses_metadata(self) -> List[Dict[str, Any]]:
         """Get metadata for all courses in the vector store"""
-        import json
-
         try:
             results = self.course_catalog.get()
             if results and "metadatas" in results:
@@ -257,8 +259,6 @@ class VectorStore:
 
     def get_lesson_link(self, course_title: str, lesson_number: int) -> Optional[str]:
         """Get lesson link for a given course title and lesson number"""
-        import json
-
         try:
             # Get course by ID (title is the ID)
             results = self.course_catalog.get(ids=[course_title])
@@ -287,8 +287,6 @@ class VectorStore:
             Dictionary with course_title, course_link, and lessons list,
             or None if course not found
         """
-        import json
-
         try:
             # First resolve the course name using semantic search
             course_title = self._resolve_course_name(course_name)
@@ -30,7 +30,7 @@ uv run mypy backend/ --exclude chroma_db --exclude __pycache__ || echo "⚠️
 echo ""
 echo "5. Running tests..."
 echo "------------------------------------------------"
-cd backend && uv run pytest -v || { echo "❌ Tests failed"; exit 1; }
+cd backend && uv run pytest -v -n auto --dist loadfile -m "" || { echo "❌ Tests failed"; exit 1; }
 
 echo ""
 echo "================================================"